@@ -0,0 +1,34 @@
+from functools import lru_cache
+from types import SimpleNamespace
+
+from supabase import Client, ClientOptions, create_client
+
+from src.config.loader import load_base_config, conf_get, env_or_value
+from src.infrastructure.repositories.supabase.events import SupabaseEventRepository
+from src.infrastructure.repositories.supabase.assets import SupabaseAssetRepository
+from src.infrastructure.repositories.supabase.agents import SupabaseAgentRepository
+from src.infrastructure.repositories.supabase.observations import SupabaseObservationRepository
+from src.infrastructure.repositories.supabase.rounds import SupabaseRoundRepository
+
+
+@lru_cache(maxsize=1)
+def supabase_client() -> Client:
+    """Process-wide Supabase client (one HTTP session reused by every repository)."""
+    conf = load_base_config()
+    url = env_or_value(conf_get(conf, "supabase.url_env"), conf_get(conf, "supabase.url"))
+    key = env_or_value(conf_get(conf, "supabase.key_env"), conf_get(conf, "supabase.key"))
+    if not url or not key:
+        raise SystemExit("Supabase URL/KEY are required (configure in config/base.yaml or env)")
+    options = ClientOptions(postgrest_client_timeout=conf_get(conf, "supabase.timeout", 30), schema="public")
+    return create_client(url, key, options=options)
+
+
+def build_repos(sb: Client, track_known_ids: bool = False) -> SimpleNamespace:
+    """Repositories over `sb`; long-running loops pass track_known_ids=True (see SupabaseEventRepository)."""
+    return SimpleNamespace(
+        events=SupabaseEventRepository(sb_client=sb, track_known_ids=track_known_ids),
+        assets=SupabaseAssetRepository(sb_client=sb),
+        agents=SupabaseAgentRepository(sb_client=sb),
+        observations=SupabaseObservationRepository(sb_client=sb),
+        rounds=SupabaseRoundRepository(sb_client=sb),
+    )
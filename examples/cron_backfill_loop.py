@@ -4,45 +4,37 @@ import logging
 from datetime import datetime, timezone, timedelta
 from typing import Any, Dict
 
-from supabase import Client, create_client
-
+from examples._deps import supabase_client, build_repos
 from src.infrastructure.fetchers.clients.coindesk import CoinDeskClient
-from src.infrastructure.repositories.supabase.events import SupabaseEventRepository
-from src.infrastructure.repositories.supabase.assets import SupabaseAssetRepository
-from src.infrastructure.repositories.supabase.agents import SupabaseAgentRepository
-from src.infrastructure.repositories.supabase.observations import SupabaseObservationRepository
-from src.infrastructure.repositories.supabase.rounds import SupabaseRoundRepository
-from src.infrastructure.indicators.ccxt_service import CcxtIndicatorService
-from src.infrastructure.llm.deepseek import DeepseekClient
 from src.application.use_cases.backfill_recent_rounds import BackfillRecentRounds
 from src.application.use_cases.ingest_events import IngestEvents
 from src.application.use_cases.generate_observations_for_active_agents import (
     GenerateObservationsForActiveAgents,
 )
 from src.application.services.indicator_snapshot import IndicatorSnapshotBuilder
-from src.config.loader import load_base_config, conf_get, env_or_value
+from src.config.loader import Settings, load_base_config, load_settings, conf_get, env_or_value
 from src.utils.time import snap_to_interval
 
-
-def make_supabase(conf: Dict[str, Any]) -> Client:
-    url = env_or_value(conf_get(conf, "supabase.url_env"), conf_get(conf, "supabase.url"))
-    key = env_or_value(conf_get(conf, "supabase.key_env"), conf_get(conf, "supabase.key"))
-    if not url or not key:
-        raise SystemExit("Supabase URL/KEY are required (configure in config/base.yaml or env)")
-    return create_client(url, key)
+# Cron cadence: a tick every 30 minutes alternates the :00 and :30 actions
+TICK_SECONDS = 30 * 60
 
 
-def build_dependencies(conf: Dict[str, Any]):
-    sb = make_supabase(conf)
+def build_dependencies(conf: Dict[str, Any], settings: Settings):
+    sb = supabase_client()
 
     # Repositories
-    events = SupabaseEventRepository(sb_client=sb)
-    assets = SupabaseAssetRepository(sb_client=sb)
-    agents = SupabaseAgentRepository(sb_client=sb)
-    observations = SupabaseObservationRepository(sb_client=sb)
-    rounds = SupabaseRoundRepository(sb_client=sb)
+    # The tick loop reuses this repository, so tracking recent stored ids pays off after the first load
+    repos = build_repos(sb, track_known_ids=True)
+    events = repos.events
+    assets = repos.assets
+    agents = repos.agents
+    observations = repos.observations
+    rounds = repos.rounds
+
+    # External services (imported here: ccxt/openai are slow to import and only needed once wired)
+    from src.infrastructure.indicators.ccxt_service import CcxtIndicatorService
+    from src.infrastructure.llm.deepseek import DeepseekClient
 
-    # External services
     indicators = CcxtIndicatorService(exchange_id=conf_get(conf, "indicators.exchange_id", os.environ.get("CCXT_EXCHANGE", "binance")))
     api_key = env_or_value(conf_get(conf, "llm.api_key_env"), conf_get(conf, "llm.api_key"))
     if not api_key:
@@ -59,6 +51,39 @@ def build_dependencies(conf: Dict[str, Any]):
         raise SystemExit("COINDESK_API_KEY is required (configure in config/base.yaml or env)")
     feed = CoinDeskClient(api_key=feed_api_key)
 
+    # Use cases (built once and reused by every tick)
+    backfill_uc = BackfillRecentRounds(
+        feed=feed,
+        events=events,
+        assets=assets,
+        agents=agents,
+        observations=observations,
+        factorizer=llm,
+        indicators=indicators,
+        rounds=rounds,
+        gen_per_agent_limit=settings.gen_per_agent_limit,
+        gen_max_tokens=settings.gen_max_tokens,
+        ingest_categories=settings.ingest_categories,
+        ind_timeframe=settings.ind_timeframe,
+        ind_rsi_period=settings.ind_rsi_period,
+        ind_sma_fast=settings.ind_sma_fast,
+        ind_sma_slow=settings.ind_sma_slow,
+        min_events_per_round=settings.min_events_per_round,
+    )
+    ingest_uc = IngestEvents(feed=feed, events=events, assets=assets)
+    observations_uc = GenerateObservationsForActiveAgents(
+        agents=agents,
+        observations=observations,
+        factorizer=llm,
+        indicators=IndicatorSnapshotBuilder(
+            indicators,
+            timeframe=settings.ind_timeframe,
+            rsi_period=settings.ind_rsi_period,
+            sma_fast=settings.ind_sma_fast,
+            sma_slow=settings.ind_sma_slow,
+        ),
+    )
+
     return {
         "feed": feed,
         "events": events,
@@ -69,41 +94,28 @@ def build_dependencies(conf: Dict[str, Any]):
         "indicators": indicators,
         "llm": llm,
         "sb": sb,
+        "backfill_uc": backfill_uc,
+        "ingest_uc": ingest_uc,
+        "observations_uc": observations_uc,
     }
 
 
-def run_tick(conf: Dict[str, Any], deps: Dict[str, Any]) -> None:
+def run_tick(settings: Settings, deps: Dict[str, Any]) -> None:
+    # Skip building isoformat() payloads when INFO is filtered out
+    verbose = logging.getLogger().isEnabledFor(logging.INFO)
     now = datetime.now(timezone.utc)
     minute = now.minute
-    logging.info("Cron: tick start", extra={"now": now.isoformat(), "minute": minute})
+    if verbose:
+        logging.info("Cron: tick start", extra={"now": now.isoformat(), "minute": minute})
 
     if minute == 0:
         # :00 — run hourly backfill rounds
         try:
-            uc = BackfillRecentRounds(
-                feed=deps["feed"],
-                events=deps["events"],
-                assets=deps["assets"],
-                agents=deps["agents"],
-                observations=deps["observations"],
-                factorizer=deps["llm"],
-                indicators=deps["indicators"],
-                rounds=deps["rounds"],
-                gen_per_agent_limit=conf_get(conf, "generation.per_agent_limit", None),
-                gen_max_tokens=int(conf_get(conf, "generation.max_tokens", conf_get(conf, "llm.max_tokens", 256))),
-                ingest_categories=conf_get(conf, "news.categories", []),
-                ind_timeframe=str(conf_get(conf, "indicators.timeframe", "1h")),
-                ind_rsi_period=int(conf_get(conf, "indicators.rsi_period", 14)),
-                ind_sma_fast=int(conf_get(conf, "indicators.sma_fast", 50)),
-                ind_sma_slow=int(conf_get(conf, "indicators.sma_slow", 200)),
-                min_events_per_round=int(conf_get(conf, "backfill.min_events_per_round", 0)),
-            )
-
-            res = uc.run(
-                n=int(conf_get(conf, "backfill.n_rounds", 2)),
-                timeframe=str(conf_get(conf, "backfill.timeframe", "1h")),
-                ingest_limit=int(conf_get(conf, "backfill.ingest_limit", 500)),
-                quote=str(conf_get(conf, "backfill.quote", "USDT")),
+            res = deps["backfill_uc"].run(
+                n=settings.backfill_n_rounds,
+                timeframe=settings.backfill_timeframe,
+                ingest_limit=settings.ingest_limit,
+                quote=settings.quote,
             )
             logging.info(
                 "Cron: backfill done",
@@ -124,54 +136,39 @@ def run_tick(conf: Dict[str, Any], deps: Dict[str, Any]) -> None:
 
         # Ingest latest events until window_end
         try:
-            ingester = IngestEvents(
-                feed=deps["feed"],
-                events=deps["events"],
-                assets=deps["assets"],
-            )
-            ires = ingester.run(
-                limit=int(conf_get(conf, "backfill.ingest_limit", 500)),
-                categories=conf_get(conf, "news.categories", []),
+            ires = deps["ingest_uc"].run(
+                limit=settings.ingest_limit,
+                categories=settings.ingest_categories,
                 until=window_end,
             )
-            logging.info(
-                "Cron: half-hour ingest done",
-                extra={"inserted": ires.inserted, "updated": ires.updated, "window_end": window_end.isoformat()},
-            )
+            if verbose:
+                logging.info(
+                    "Cron: half-hour ingest done",
+                    extra={"inserted": ires.inserted, "updated": ires.updated, "window_end": window_end.isoformat()},
+                )
         except Exception as e:
             logging.warning("Cron: half-hour ingest failed", extra={"error": str(e)})
 
         # Generate observations only for the half-hour window
         try:
-            gen = GenerateObservationsForActiveAgents(
-                agents=deps["agents"],
-                observations=deps["observations"],
-                factorizer=deps["llm"],
-                indicators=IndicatorSnapshotBuilder(
-                    deps["indicators"],
-                    timeframe=str(conf_get(conf, "indicators.timeframe", "1h")),
-                    rsi_period=int(conf_get(conf, "indicators.rsi_period", 14)),
-                    sma_fast=int(conf_get(conf, "indicators.sma_fast", 50)),
-                    sma_slow=int(conf_get(conf, "indicators.sma_slow", 200)),
-                ),
-            )
-            gres = gen.run(
+            gres = deps["observations_uc"].run(
                 window_start=window_start,
                 window_end=window_end,
-                per_agent_limit=conf_get(conf, "generation.per_agent_limit", None),
-                max_tokens=int(conf_get(conf, "generation.max_tokens", conf_get(conf, "llm.max_tokens", 256))),
-            )
-            logging.info(
-                "Cron: half-hour observations done",
-                extra={
-                    "total_agents": gres.total_agents,
-                    "total_events": gres.total_events,
-                    "inserted": gres.upserted.inserted,
-                    "updated": gres.upserted.updated,
-                    "window_start": window_start.isoformat(),
-                    "window_end": window_end.isoformat(),
-                },
+                per_agent_limit=settings.gen_per_agent_limit,
+                max_tokens=settings.gen_max_tokens,
             )
+            if verbose:
+                logging.info(
+                    "Cron: half-hour observations done",
+                    extra={
+                        "total_agents": gres.total_agents,
+                        "total_events": gres.total_events,
+                        "inserted": gres.upserted.inserted,
+                        "updated": gres.upserted.updated,
+                        "window_start": window_start.isoformat(),
+                        "window_end": window_end.isoformat(),
+                    },
+                )
         except Exception as e:
             logging.warning("Cron: half-hour observations failed", extra={"error": str(e)})
 
@@ -183,26 +180,29 @@ def run_tick(conf: Dict[str, Any], deps: Dict[str, Any]) -> None:
 def main():
     logging.basicConfig(level=logging.INFO)
     conf = load_base_config()
-    deps = build_dependencies(conf)
+    settings = load_settings()
+    deps = build_dependencies(conf, settings)
 
-    # Run a tick every 30 minutes to alternate :00 and :30 actions
-    tick_freq = "30m"
-    eager = bool(conf_get(conf, "cron.eager_first_run", True))
-    jitter = int(conf_get(conf, "cron.jitter_seconds", 0) or 0)
+    jitter = min(settings.jitter_seconds, 5) if settings.jitter_seconds > 0 else 0  # avoid large drift
+    verbose = logging.getLogger().isEnabledFor(logging.INFO)
 
-    if eager:
-        run_tick(conf, deps)
+    if settings.eager_first_run:
+        run_tick(settings, deps)
 
     try:
         while True:
-            now = datetime.now(timezone.utc)
-            next_tick = snap_to_interval(now, freq=tick_freq, mode="ceil")
-            sleep_sec = max(0, int((next_tick - now).total_seconds()))
-            if jitter > 0:
-                sleep_sec += min(jitter, 5)  # avoid large drift
-            logging.info("Cron: sleeping", extra={"seconds": sleep_sec, "next": next_tick.isoformat()})
-            time.sleep(sleep_sec)
-            run_tick(conf, deps)
+            # Target the next wall-clock boundary strictly after now, so a tick that
+            # finishes on a boundary never re-runs it
+            next_wall = (int(time.time()) // TICK_SECONDS + 1) * TICK_SECONDS
+            next_tick = datetime.fromtimestamp(next_wall, tz=timezone.utc)
+            sleep_sec = next_wall - time.time() + jitter
+            if verbose:
+                logging.info("Cron: sleeping", extra={"seconds": int(sleep_sec), "next": next_tick.isoformat()})
+            # sleep() may wake early; keep sleeping until the boundary is really reached
+            while sleep_sec > 0:
+                time.sleep(sleep_sec)
+                sleep_sec = next_wall + jitter - time.time()
+            run_tick(settings, deps)
     except KeyboardInterrupt:
         logging.info("Cron: stopped by user")
 
@@ -2,19 +2,10 @@ import os
 import logging
 from datetime import datetime, timedelta, timezone
 
-from supabase import Client, create_client
-
+from examples._deps import supabase_client, build_repos
 from src.domain.rounds import Round
-from src.infrastructure.repositories.supabase.observations import SupabaseObservationRepository
 from src.infrastructure.indicators.ccxt_service import CcxtIndicatorService
 from src.application.use_cases.evaluate_round import EvaluateRound
-from src.infrastructure.repositories.supabase.rounds import SupabaseRoundRepository
-
-
-def make_supabase() -> Client:
-    url = os.environ["SUPABASE_DEV_URL"]
-    key = os.environ["SUPABASE_DEV_KEY"]
-    return create_client(url, key)
 
 
 def parse_iso_utc(value: str | None):
@@ -27,9 +18,7 @@ def parse_iso_utc(value: str | None):
 
 def main():
     logging.basicConfig(level=logging.INFO)
-    sb = make_supabase()
-    observations = SupabaseObservationRepository(sb_client=sb)
-    rounds_repo = SupabaseRoundRepository(sb_client=sb)
+    repos = build_repos(supabase_client())
     indicators = CcxtIndicatorService(exchange_id=os.environ.get("CCXT_EXCHANGE", "binance"))
 
     now = datetime.now(tz=timezone.utc)
@@ -40,7 +29,7 @@ def main():
 
     rnd_key = os.environ.get("ROUND_KEY", f"round-{start.strftime('%Y%m%d%H%M')}-{end.strftime('%Y%m%d%H%M')}")
     rnd = Round(key=rnd_key, window_start=start, window_end=end).snapped(timeframe=timeframe)
-    uc = EvaluateRound(observations=observations, indicators=indicators, rounds=rounds_repo)
+    uc = EvaluateRound(observations=repos.observations, indicators=indicators, rounds=repos.rounds)
     res = uc.run(round=rnd, quote=quote, timeframe=timeframe)
 
     print({
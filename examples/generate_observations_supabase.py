@@ -2,24 +2,14 @@ import os
 import logging
 from datetime import datetime, timedelta, timezone
 
-from supabase import Client, create_client
-
-from src.infrastructure.repositories.supabase.agents import SupabaseAgentRepository
-from src.infrastructure.repositories.supabase.observations import SupabaseObservationRepository
+from examples._deps import supabase_client, build_repos
 from src.application.use_cases.generate_observations_for_active_agents import (
     GenerateObservationsForActiveAgents,
 )
 from src.infrastructure.llm.deepseek import DeepseekClient
-from src.infrastructure.indicators.ccxt_service import CcxtIndicatorService
 from src.application.services.indicator_snapshot import IndicatorSnapshotBuilder
 
 
-def make_supabase() -> Client:
-    url = os.environ["SUPABASE_DEV_URL"]
-    key = os.environ["SUPABASE_DEV_KEY"]
-    return create_client(url, key)
-
-
 def parse_iso_utc(value: str | None):
     if not value:
         return None
@@ -30,9 +20,7 @@ def parse_iso_utc(value: str | None):
 
 def main():
     logging.basicConfig(level=logging.INFO)
-    sb = make_supabase()
-    agents_repo = SupabaseAgentRepository(sb_client=sb)
-    observations_repo = SupabaseObservationRepository(sb_client=sb)
+    repos = build_repos(supabase_client())
 
 
     api_key = os.environ.get("DEEPSEEK_API_KEY")
@@ -44,6 +32,8 @@ def main():
     # Indicators (optional)
     indicators = None
     try:
+        from src.infrastructure.indicators.ccxt_service import CcxtIndicatorService
+
         ind_svc = CcxtIndicatorService(exchange_id=os.environ.get("CCXT_EXCHANGE", "binance"))
         indicators = IndicatorSnapshotBuilder(ind_svc)
     except Exception:
@@ -55,8 +45,8 @@ def main():
     per_agent_limit = "10"
 
     uc = GenerateObservationsForActiveAgents(
-        agents=agents_repo,
-        observations=observations_repo,
+        agents=repos.agents,
+        observations=repos.observations,
         factorizer=llm,
         indicators=indicators,
     )
@@ -1,11 +1,10 @@
-from typing import Protocol, Iterable, List
+from typing import Protocol, Dict, Iterable, Tuple
 from dataclasses import dataclass
 from datetime import datetime
-from dataclasses import field
 from src.domain.events import Event
 from src.domain.assets import Asset
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class NewsItemDTO:
     external_id: str
     external_url: str
@@ -13,15 +12,15 @@ class NewsItemDTO:
     title: str
     content: str
     source: str
-    categories: List[str] = field(default_factory=list)
+    categories: Tuple[str, ...] = ()
 
 class NewsFeedPort(Protocol):
-    def fetch(self, limit: int = 10, categories: List[str] = [], until: datetime | None = None) -> Iterable[NewsItemDTO]: ...
+    def fetch(self, limit: int = 10, categories: Tuple[str, ...] = (), until: datetime | None = None) -> Iterable[NewsItemDTO]: ...
 
 
 # --- LLM factorization (DeepSeek via OpenAI-compatible async client) ---
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EventFactorDTO:
     factor: str
     zi_score: int
@@ -38,7 +37,7 @@ class EventFactorizerPort(Protocol):
     ) -> EventFactorDTO: ...
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SMACrossDTO:
     fast: float
     slow: float
@@ -46,7 +45,7 @@ class SMACrossDTO:
     prev_slow: float
     crossed: str | None  
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PriceChangeDTO:
     start_ts: datetime
     end_ts: datetime
@@ -95,4 +94,26 @@ class IndicatorServicePort(Protocol):
         timeframe: str = "1h",
         market: str | None = None,
         quote: str = "USDT",
-    ) -> 'PriceChangeDTO': ...
\ No newline at end of file
+    ) -> 'PriceChangeDTO': ...
+
+    def get_price_changes(
+        self,
+        assets: Iterable[Asset],
+        start: datetime,
+        end: datetime,
+        timeframe: str = "1h",
+        quote: str = "USDT",
+    ) -> Dict[str, 'PriceChangeDTO']: ...
+
+    def supported_symbols(self, assets: Iterable[Asset], quote: str = "USDT") -> set[str]: ...
+
+    # Warm any candle cache with `lookback` candles up to `at` so later indicator calls reuse it
+    def prefetch(
+        self,
+        asset: Asset,
+        at: datetime,
+        timeframe: str = "1h",
+        lookback: int = 200,
+        market: str | None = None,
+        quote: str = "USDT",
+    ) -> None: ...
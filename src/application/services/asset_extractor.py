@@ -1,10 +1,14 @@
 import re
-from typing import Iterable, List, Set
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Iterator, List, Set
 
 from src.domain.assets import Asset
 from src.domain.events import Event
 from src.repositories.assets import AssetRepository
 
+# Maximal ASCII-alphanumeric runs; mirrors the (?<![A-Za-z0-9]) / (?![A-Za-z0-9]) symbol boundaries
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+")
+
 
 class AssetExtractor:
     """
@@ -12,8 +16,12 @@ class AssetExtractor:
 
     Strategy:
     - Known symbols come from an AssetRepository (or a passed-in set).
-    - Matches symbols in `title` and `content` using a compiled regex:
-      - Case-insensitive, optional leading "$", word-like boundaries.
+    - Matches symbols in `title` and `content` (case-insensitive, optional leading "$",
+      word-like boundaries):
+      - Alphanumeric symbols (the usual tickers) are matched by splitting the text into
+        alphanumeric tokens once and looking each token up in a set, so the scan is
+        linear in the text and independent of the number of symbols.
+      - Any other symbols fall back to a compiled regex alternation.
     - Also checks `categories` for exact symbol matches.
     - Returns unique assets; empty list if none found.
     """
@@ -22,7 +30,10 @@ class AssetExtractor:
         if not isinstance(known_symbols, set):
             known_symbols = set(known_symbols or [])
         self._symbols: Set[str] = {s.strip().upper() for s in known_symbols if (s or "").strip()}
-        self._pattern = self._compile_pattern(self._symbols)
+        self._token_symbols: Set[str] = {s for s in self._symbols if _TOKEN_RE.fullmatch(s)}
+        self._pattern = _compile_pattern(frozenset(self._symbols - self._token_symbols))
+        # Texts shorter than the shortest symbol cannot contain a match
+        self._min_symbol_len = min(map(len, self._symbols), default=0)
 
     @classmethod
     def from_repository(cls, repo: AssetRepository) -> "AssetExtractor":
@@ -35,32 +46,48 @@ class AssetExtractor:
         if not self._symbols:
             return set()
 
-        haystack = f"{event.title or ''} \n {event.content or ''}"
+        title = event.title or ""
+        content = event.content or ""
+        if max(len(title), len(content)) < self._min_symbol_len:
+            # Empty or trivially short text (e.g. category-only events): skip the scan
+            matches_in_text: Set[str] = set()
+        else:
+            # Case-fold once; symbols are stored uppercase so matching can stay case-sensitive
+            haystack = f"{title} \n {content}".upper()
 
-        matches_in_text = set(m.group(1).upper() for m in self._pattern.finditer(haystack))
+            # A ticker matches exactly when it equals a whole alphanumeric token of the text
+            matches_in_text = self._token_symbols.intersection(_TOKEN_RE.findall(haystack))
+            if len(self._token_symbols) < len(self._symbols):
+                matches_in_text.update(m.group(1) for m in self._pattern.finditer(haystack))
 
         # Include exact category matches as symbols too
-        cat_symbols = { (c or "").strip().upper() for c in (event.categories or []) }
-        matches_in_cats = { c for c in cat_symbols if c in self._symbols }
-
-        return { *matches_in_text, *matches_in_cats }
+        matches_in_text.update(self._symbols.intersection((c or "").strip().upper() for c in (event.categories or ())))
+        return matches_in_text
 
     def extract_assets(self, event: Event) -> List[Asset]:
         """
         Return a list of Asset objects (unique by symbol). Empty if none.
         """
-        syms = self.extract_symbols(event)
-        # Sort for determinism
-        return [Asset(symbol=s) for s in sorted(syms)]
-
-    # --- internals ---
-    def _compile_pattern(self, symbols: Set[str]) -> re.Pattern:
-        if not symbols:
-            # Match nothing
-            return re.compile(r"a\b^", re.IGNORECASE)
-
-        # Sort by length descending to prefer the longest symbol where relevant
-        parts = [re.escape(s) for s in sorted(symbols, key=lambda x: (-len(x), x))]
-        # Optional leading '$', and ensure not surrounded by alphanumerics
-        pattern = rf"(?<![A-Za-z0-9])(?:\$)?(" + "|".join(parts) + rf")(?![A-Za-z0-9])"
-        return re.compile(pattern, re.IGNORECASE)
\ No newline at end of file
+        return list(self.iter_assets_sorted(event))
+
+    def iter_assets_sorted(self, event: Event) -> Iterator[Asset]:
+        """
+        Yield matched assets in symbol order (sorted for determinism), lazily.
+        """
+        for s in sorted(self.extract_symbols(event)):
+            yield Asset(symbol=s)
+
+
+@lru_cache(maxsize=16)
+def _compile_pattern(symbols: FrozenSet[str]) -> re.Pattern:
+    """Compile the (uppercase, case-sensitive) symbol alternation; cached so extractors over
+    the same symbol set share it."""
+    if not symbols:
+        # Match nothing
+        return re.compile(r"a\b^")
+
+    # Sort by length descending to prefer the longest symbol where relevant
+    parts = [re.escape(s) for s in sorted(symbols, key=lambda x: (-len(x), x))]
+    # Optional leading '$', and ensure not surrounded by alphanumerics
+    pattern = rf"(?<![A-Za-z0-9])(?:\$)?(" + "|".join(parts) + rf")(?![A-Za-z0-9])"
+    return re.compile(pattern)
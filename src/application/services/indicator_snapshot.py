@@ -1,12 +1,16 @@
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Tuple
 import logging
 
 from src.application.ports import IndicatorServicePort
 from src.domain.assets import Asset
 
 
+_UTC = timezone.utc
+_ZERO = timedelta(0)
+
+
 @dataclass(frozen=True)
 class IndicatorSnapshot:
     text: str
@@ -29,30 +33,82 @@ class IndicatorSnapshotBuilder:
         self.sma_slow = sma_slow
         self._log = logging.getLogger(__name__)
 
+        # Labels don't depend on the asset; build them once rather than per snapshot
+        self._rsi_label = f"RSI({rsi_period},{timeframe})"
+        self._sma_label = f"SMA{sma_fast}/{sma_slow}({timeframe})"
+        self._rsi_na = f"{self._rsi_label}=NA"
+        self._sma_na = f"{self._sma_label}=NA"
+        # What `build` yields when neither indicator can be computed (e.g. no market)
+        self._all_na = IndicatorSnapshot(text=f"{self._rsi_na}; {self._sma_na}")
+        # RSI looks back 3*period candles, the SMA cross slow_period: one fetch covers both
+        self._lookback = max(3 * rsi_period, sma_slow)
+        self._prefetch = indicator_service.prefetch
+        self._get_rsi = indicator_service.get_rsi
+        self._get_sma_cross = indicator_service.get_sma_cross
+
     def build(self, asset: Asset, at: datetime) -> IndicatorSnapshot:
         self._require_utc(at, "at")
 
         parts: list[str] = []
 
         try:
-            rsi_val = self.ind.get_rsi(asset=asset, at=at, timeframe=self.timeframe, period=self.rsi_period)
-            parts.append(f"RSI({self.rsi_period},{self.timeframe})={rsi_val:.2f}")
+            self._prefetch(asset=asset, at=at, timeframe=self.timeframe, lookback=self._lookback)
+        except Exception as e:
+            # Not fatal: each indicator still fetches what it needs
+            self._log.debug("Indicators: snapshot prefetch failed", extra={"asset": asset.symbol, "error": str(e)})
+
+        try:
+            rsi_val = self._get_rsi(asset=asset, at=at, timeframe=self.timeframe, period=self.rsi_period)
+            parts.append(f"{self._rsi_label}={rsi_val:.2f}")
             self._log.info("Indicators: snapshot RSI computed", extra={"asset": asset.symbol, "value": rsi_val})
         except Exception as e:
-            parts.append(f"RSI({self.rsi_period},{self.timeframe})=NA")
+            parts.append(self._rsi_na)
             self._log.debug("Indicators: snapshot RSI failed", extra={"asset": asset.symbol, "error": str(e)})
 
         try:
-            cross = self.ind.get_sma_cross(asset=asset, at=at, timeframe=self.timeframe, fast_period=self.sma_fast, slow_period=self.sma_slow)
-            parts.append(f"SMA{self.sma_fast}/{self.sma_slow}({self.timeframe})={cross.fast:.2f}/{cross.slow:.2f},{cross.crossed or 'no-cross'}")
+            cross = self._get_sma_cross(asset=asset, at=at, timeframe=self.timeframe, fast_period=self.sma_fast, slow_period=self.sma_slow)
+            parts.append(f"{self._sma_label}={cross.fast:.2f}/{cross.slow:.2f},{cross.crossed or 'no-cross'}")
             self._log.info("Indicators: snapshot SMA cross computed", extra={"asset": asset.symbol, "crossed": cross.crossed})
         except Exception as e:
-            parts.append(f"SMA{self.sma_fast}/{self.sma_slow}({self.timeframe})=NA")
+            parts.append(self._sma_na)
             self._log.debug("Indicators: snapshot SMA cross failed", extra={"asset": asset.symbol, "error": str(e)})
 
         text = "; ".join(parts)
         return IndicatorSnapshot(text=text)
 
+    def build_many(self, pairs: Iterable[Tuple[Asset, datetime]]) -> Dict[Tuple[str, datetime], IndicatorSnapshot]:
+        """
+        Build one snapshot per distinct (asset symbol, at) pair, keyed by that pair.
+        Pairs whose snapshot cannot be built are left out of the result.
+        """
+        pairs = list(pairs)
+        supported = self.has_snapshots(asset for asset, _ in pairs)
+        out: Dict[Tuple[str, datetime], IndicatorSnapshot] = {}
+        todo: Dict[Tuple[str, datetime], Tuple[Asset, datetime]] = {}
+        for asset, at in pairs:
+            key = (asset.symbol, at)
+            if key in out or key in todo:
+                continue
+            if (asset.symbol or "").strip().upper() not in supported:
+                # No market for this asset: both lookups would fail, so skip the calls
+                out[key] = self._all_na
+                continue
+            todo[key] = (asset, at)
+
+        # Sequential on purpose: callers already run inside LLM/window pools and the
+        # indicator service wraps one synchronous exchange client; `build` prefetches
+        # each pair's candles in a single call
+        for key, (asset, at) in todo.items():
+            try:
+                out[key] = self.build(asset=asset, at=at)
+            except Exception as e:
+                self._log.debug("Indicators: snapshot failed", extra={"asset": asset.symbol, "error": str(e)})
+        return out
+
+    def has_snapshots(self, assets: Iterable[Asset]) -> set[str]:
+        """Symbols (uppercase) the indicator service can compute snapshots for."""
+        return self.ind.supported_symbols(assets)
+
     def _require_utc(self, dt: datetime, name: str) -> None:
-        if dt.tzinfo is None or dt.utcoffset() != timedelta(0):
+        if dt.tzinfo is None or (dt.tzinfo is not _UTC and dt.utcoffset() != _ZERO):
             raise ValueError(f"{name} must be timezone-aware UTC")
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
 import logging
-import re
+import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
 
-from src.utils.time import snap_to_interval
+from src.utils.time import _parse_freq, snap_to_interval
 from src.domain.rounds import Round
 from src.application.use_cases.ingest_events import IngestEvents
 from src.application.use_cases.generate_observations_for_active_agents import (
@@ -23,15 +23,6 @@ from src.application.services.indicator_snapshot import IndicatorSnapshotBuilder
 from src.application.ports import IndicatorServicePort
 
 
-def _parse_freq_seconds(freq: str) -> int:
-    m = re.fullmatch(r"\s*(\d+)\s*([mhdMHD])\s*", freq)
-    if not m:
-        raise ValueError("freq must look like '30m', '1h', or '1d'")
-    n, u = m.groups()
-    units = {"m": 60, "h": 3600, "d": 86400}
-    return int(n) * units[u.lower()]
-
-
 @dataclass
 class BackfillResult:
     requested: int
@@ -54,7 +45,7 @@ class BackfillRecentRounds:
         rounds: RoundRepository,
         gen_per_agent_limit: int | None = None,
         gen_max_tokens: int = 256,
-        ingest_categories: list[str] | None = None,
+        ingest_categories: Iterable[str] | None = None,
         ind_timeframe: str = "1h",
         ind_rsi_period: int = 14,
         ind_sma_fast: int = 50,
@@ -74,7 +65,7 @@ class BackfillRecentRounds:
         # Store generation/ingestion tuning
         self._gen_per_agent_limit = gen_per_agent_limit
         self._gen_max_tokens = gen_max_tokens
-        self._ingest_categories = ingest_categories or []
+        self._ingest_categories = tuple(ingest_categories or ())
         self._min_events_per_round = min_events_per_round
 
         # Compose reusable UCs
@@ -107,100 +98,108 @@ class BackfillRecentRounds:
 
         now = now or datetime.now(timezone.utc)
         end_anchor = snap_to_interval(now, freq=timeframe, mode="floor")
-        step_sec = _parse_freq_seconds(timeframe)
-        step = timedelta(seconds=step_sec)
+        step_sec = _parse_freq(timeframe)
 
-        # Build last N windows [start, end]
+        # Build last N windows [start, end] from epoch seconds; keys are formatted with
+        # time.strftime on struct_time, avoiding per-window datetime arithmetic
+        anchor_ts = int(end_anchor.timestamp())
         windows: List[Round] = []
-        keys: List[str] = []
         for i in range(n):
-            end = end_anchor - i * step
-            start = end - step
-            rnd = Round(key=f"round-{start.strftime('%Y%m%d%H%M')}-{end.strftime('%Y%m%d%H%M')}", window_start=start, window_end=end)
+            end_ts = anchor_ts - i * step_sec
+            start_ts = end_ts - step_sec
+            rnd = Round(
+                key=f"round-{time.strftime('%Y%m%d%H%M', time.gmtime(start_ts))}-{time.strftime('%Y%m%d%H%M', time.gmtime(end_ts))}",
+                window_start=datetime.fromtimestamp(start_ts, tz=timezone.utc),
+                window_end=datetime.fromtimestamp(end_ts, tz=timezone.utc),
+                start_bucket=start_ts,
+                end_bucket=end_ts,
+            )
             windows.append(rnd)
-            keys.append(rnd.key)
 
-        have = self.rounds.existing_round_keys(keys)
+        have = self.rounds.existing_round_keys(rnd.key for rnd in windows)
+        if not isinstance(have, set):
+            # Guard against implementations returning a list (O(n) membership below)
+            have = set(have)
         self._log.info("Backfill: existing rounds", extra={"requested": n, "existing": len(have)})
 
-        processed = 0
-        skipped = 0
-        for rnd in windows:
-            if rnd.key in have:
-                skipped += 1
-                continue
+        todo = [rnd for rnd in windows if rnd.key not in have]
+        skipped = len(windows) - len(todo)
 
-            # 1) Decide whether to ingest based on existing events in the round window
-            try:
-                existing_events = self.events.count_in_window(rnd.window_start, rnd.window_end, with_asset_only=True)
-            except Exception:
-                existing_events = 0
-            self._log.info(
-                "Backfill: existing events in window",
-                extra={"round_key": rnd.key, "count": existing_events},
-            )
+        for rnd in todo:
+            self._process_window(rnd, timeframe=timeframe, ingest_limit=ingest_limit, quote=quote)
+        processed = len(todo)
 
-            should_ingest = True
-            if isinstance(self._min_events_per_round, int) and self._min_events_per_round > 0:
-                should_ingest = existing_events < self._min_events_per_round
+        return BackfillResult(requested=n, existing=len(have), processed=processed, skipped=skipped)
 
-            if should_ingest:
+    def _process_window(self, rnd: Round, *, timeframe: str, ingest_limit: int, quote: str) -> None:
+        # 1) Decide whether to ingest based on existing events in the round window
+        try:
+            existing_events = self.events.count_in_window(rnd.window_start, rnd.window_end, with_asset_only=True)
+        except Exception:
+            existing_events = 0
+        self._log.info(
+            "Backfill: existing events in window",
+            extra={"round_key": rnd.key, "count": existing_events},
+        )
+
+        should_ingest = True
+        if isinstance(self._min_events_per_round, int) and self._min_events_per_round > 0:
+            should_ingest = existing_events < self._min_events_per_round
+
+        if should_ingest:
+            self._log.info(
+                "Backfill: ingesting events",
+                extra={
+                    "round_key": rnd.key,
+                    "until": rnd.window_end.isoformat(),
+                    "current_count": existing_events,
+                    "target": self._min_events_per_round,
+                },
+            )
+            try:
+                ingest_res = self._ingest.run(
+                    limit=ingest_limit,
+                    categories=(self._ingest_categories or None),
+                    until=rnd.window_end,
+                )
                 self._log.info(
-                    "Backfill: ingesting events",
-                    extra={
-                        "round_key": rnd.key,
-                        "until": rnd.window_end.isoformat(),
-                        "current_count": existing_events,
-                        "target": self._min_events_per_round,
-                    },
+                    "Backfill: ingest result",
+                    extra={"inserted": ingest_res.inserted, "updated": ingest_res.updated},
                 )
+                # Re-check events after ingest to account for upsert no-ops
                 try:
-                    ingest_res = self._ingest.run(
-                        limit=ingest_limit,
-                        categories=(self._ingest_categories or None),
-                        until=rnd.window_end,
-                    )
-                    self._log.info(
-                        "Backfill: ingest result",
-                        extra={"inserted": ingest_res.inserted, "updated": ingest_res.updated},
-                    )
-                    # Re-check events after ingest to account for upsert no-ops
-                    try:
-                        post_events = self.events.count_in_window(rnd.window_start, rnd.window_end, with_asset_only=True)
-                    except Exception:
-                        post_events = existing_events
-                    self._log.info(
-                        "Backfill: events after ingest",
-                        extra={"round_key": rnd.key, "count": post_events},
-                    )
-                except Exception as e:
-                    self._log.warning(
-                        "Backfill: ingest failed", extra={"round_key": rnd.key, "error": str(e)}, exc_info=True
-                    )
-            else:
+                    post_events = self.events.count_in_window(rnd.window_start, rnd.window_end, with_asset_only=True)
+                except Exception:
+                    post_events = existing_events
                 self._log.info(
-                    "Backfill: skip ingest (enough events)",
-                    extra={"round_key": rnd.key, "current_count": existing_events, "target": self._min_events_per_round},
-                )
-
-            # 2) Generate observations in the window
-            self._log.info("Backfill: generating observations", extra={"round_key": rnd.key})
-            try:
-                self._gen_obs.run(
-                    window_start=rnd.window_start,
-                    window_end=rnd.window_end,
-                    per_agent_limit=self._gen_per_agent_limit,
-                    max_tokens=self._gen_max_tokens,
+                    "Backfill: events after ingest",
+                    extra={"round_key": rnd.key, "count": post_events},
                 )
             except Exception as e:
-                self._log.warning("Backfill: generate observations failed", extra={"round_key": rnd.key, "error": str(e)}, exc_info=True)
-
-            # 3) Evaluate and save round
-            self._log.info("Backfill: evaluating round", extra={"round_key": rnd.key})
-            try:
-                self._eval.run(round=rnd, quote=quote, timeframe=timeframe)
-            except Exception as e:
-                self._log.warning("Backfill: evaluate round failed", extra={"round_key": rnd.key, "error": str(e)}, exc_info=True)
-            processed += 1
+                self._log.warning(
+                    "Backfill: ingest failed", extra={"round_key": rnd.key, "error": str(e)}, exc_info=True
+                )
+        else:
+            self._log.info(
+                "Backfill: skip ingest (enough events)",
+                extra={"round_key": rnd.key, "current_count": existing_events, "target": self._min_events_per_round},
+            )
 
-        return BackfillResult(requested=n, existing=len(have), processed=processed, skipped=skipped)
+        # 2) Generate observations in the window
+        self._log.info("Backfill: generating observations", extra={"round_key": rnd.key})
+        try:
+            self._gen_obs.run(
+                window_start=rnd.window_start,
+                window_end=rnd.window_end,
+                per_agent_limit=self._gen_per_agent_limit,
+                max_tokens=self._gen_max_tokens,
+            )
+        except Exception as e:
+            self._log.warning("Backfill: generate observations failed", extra={"round_key": rnd.key, "error": str(e)}, exc_info=True)
+
+        # 3) Evaluate and save round
+        self._log.info("Backfill: evaluating round", extra={"round_key": rnd.key})
+        try:
+            self._eval.run(round=rnd, quote=quote, timeframe=timeframe)
+        except Exception as e:
+            self._log.warning("Backfill: evaluate round failed", extra={"round_key": rnd.key, "error": str(e)}, exc_info=True)
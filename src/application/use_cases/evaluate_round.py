@@ -1,15 +1,30 @@
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List
+from typing import Dict, List, Set, Tuple
+import heapq
 import logging
+import time
 
 from src.domain.rounds import Round, RoundAgentScore, RoundEvaluation
 from src.repositories.observations import ObservationRepository
 from src.application.ports import IndicatorServicePort
 from src.domain.assets import Asset
-from src.utils.time import snap_to_interval
 from src.repositories.rounds import RoundRepository
 
 
+_UTC = timezone.utc
+_ZERO = timedelta(0)
+
+# Asset is a frozen value object; intern by symbol so repeat rounds reuse instances
+_ASSET_CACHE: Dict[str, Asset] = {}
+
+
+def _asset(sym: str) -> Asset:
+    a = _ASSET_CACHE.get(sym)
+    if a is None:
+        a = _ASSET_CACHE[sym] = Asset(symbol=sym)
+    return a
+
+
 class EvaluateRound:
     def __init__(self, observations: ObservationRepository, indicators: IndicatorServicePort, rounds: RoundRepository | None = None) -> None:
         self.observations = observations
@@ -17,63 +32,70 @@ class EvaluateRound:
         self.rounds = rounds
         self._log = logging.getLogger(__name__)
 
-    def run(self, round: Round, quote: str = "USDT", timeframe: str = "1h") -> RoundEvaluation:
+    def run(self, round: Round, quote: str = "USDT", timeframe: str = "1h", top_k: int | None = None) -> RoundEvaluation:
         self._require_utc(round.window_start, "round.window_start")
         self._require_utc(round.window_end, "round.window_end")
-        snapped_start = snap_to_interval(round.window_start, freq=timeframe, mode="floor")
-        snapped_end = snap_to_interval(round.window_end, freq=timeframe, mode="floor")
+        # Snap once; the bucket bounds are reused for the checks below
+        snapped = round.snapped(timeframe=timeframe)
+        snapped_start = snapped.window_start
+        snapped_end = snapped.window_end
         self._log.info("EvaluateRound: snapped window", extra={"start": snapped_start.isoformat(), "end": snapped_end.isoformat(), "timeframe": timeframe})
-        if snapped_end <= snapped_start:
+        if snapped.end_bucket <= snapped.start_bucket:
             raise ValueError("Snapped window_end must be greater than window_start for given timeframe")
-        now_utc = datetime.now(timezone.utc)
-        if snapped_end > now_utc:
+        if snapped.end_bucket > time.time():
             raise ValueError("round window_end cannot be in the future")
 
-        obs = self.observations.list_in_window(snapped_start, snapped_end)
-        self._log.info("EvaluateRound: observations fetched", extra={"count": len(obs)})
-
-        asset_cache: Dict[str, float] = {}
-        failed_assets: set[str] = set()
-
-        # One row per observation: score = pct_price_change * zi_score
-        agent_scores: List[RoundAgentScore] = []
-        for o in obs:
-            sym = (o.asset_symbol or "").strip().upper()
+        # Stream observations and keep only what scoring needs; rows that can never
+        # score (no symbol / zi_score / id) are dropped as they arrive
+        log_debug = self._log.debug
+        pending: List[Tuple[str, str, str, int]] = []
+        keep = pending.append
+        symbols: Set[str] = set()
+        fetched = 0
+        for o in self.observations.iter_in_window(snapped_start, snapped_end):
+            fetched += 1
+            sym = o.normalized_symbol
             if not sym:
                 continue
-            if o.zi_score is None:
-                continue
-            if sym in failed_assets:
+            zi = o.zi_score
+            if zi is None:
                 continue
-            if sym not in asset_cache:
-                try:
-                    pc = self.indicators.get_price_change(
-                        asset=Asset(symbol=sym),
-                        start=snapped_start,
-                        end=snapped_end,
-                        timeframe=timeframe,
-                        market=None,
-                        quote=quote,
-                    )
-                    asset_cache[sym] = float(pc.pct_change)
-                except Exception:
-                    failed_assets.add(sym)
-                    self._log.debug("EvaluateRound: price change unavailable, skipping symbol", extra={"symbol": sym})
-                    continue
             if not o.id:
                 # Can't persist without a real observation_id (DB expects uuid)
-                self._log.debug("EvaluateRound: missing observation_id, skipping", extra={"agent_id": o.agent_id, "event_id": o.event_id, "symbol": sym})
+                log_debug("EvaluateRound: missing observation_id, skipping", extra={"agent_id": o.agent_id, "event_id": o.event_id, "symbol": sym})
+                continue
+            symbols.add(sym)
+            keep((o.agent_id, str(o.id), sym, int(zi)))
+        self._log.info("EvaluateRound: observations fetched", extra={"count": fetched})
+
+        # Price every symbol the round needs in one call, then score with dict lookups
+        changes = self.indicators.get_price_changes(
+            assets=[_asset(sym) for sym in sorted(symbols)],
+            start=snapped_start,
+            end=snapped_end,
+            timeframe=timeframe,
+            quote=quote,
+        ) if symbols else {}
+        asset_cache: Dict[str, float] = {sym: float(pc.pct_change) for sym, pc in changes.items()}
+        if len(asset_cache) < len(symbols):
+            log_debug("EvaluateRound: price change unavailable, skipping symbols", extra={"symbols": sorted(symbols - asset_cache.keys())})
+
+        # One row per observation: score = pct_price_change * zi_score
+        agent_scores: List[RoundAgentScore] = []
+        # Local bindings keep attribute lookups out of the per-observation loop
+        pct_for = asset_cache.get
+        add_score = agent_scores.append
+        for agent_id, obs_id, sym, zi in pending:
+            pct = pct_for(sym)
+            if pct is None:
                 continue
-            score_val = asset_cache[sym] * int(o.zi_score)
-            agent_scores.append(
-                RoundAgentScore(
-                    agent_id=o.agent_id,
-                    observation_id=str(o.id),
-                    score=float(score_val),
-                )
-            )
-
-        agent_scores.sort(key=lambda s: s.score, reverse=True)
+            add_score(RoundAgentScore(agent_id=agent_id, observation_id=obs_id, score=float(pct * zi)))
+
+        if top_k is not None and top_k < len(agent_scores):
+            # Bounded leaderboard: keep only the best `top_k` rows (also limits what is saved)
+            agent_scores = heapq.nlargest(max(0, top_k), agent_scores, key=lambda s: s.score)
+        else:
+            agent_scores.sort(key=lambda s: s.score, reverse=True)
         evaluation = RoundEvaluation(round=round, agent_scores=agent_scores)
 
         if self.rounds is not None:
@@ -86,5 +108,5 @@ class EvaluateRound:
         return evaluation
 
     def _require_utc(self, dt: datetime, name: str) -> None:
-        if dt.tzinfo is None or dt.utcoffset() != timedelta(0):
+        if dt.tzinfo is None or (dt.tzinfo is not _UTC and dt.utcoffset() != _ZERO):
             raise ValueError(f"{name} must be timezone-aware UTC")
@@ -1,8 +1,10 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from src.domain.events import Event
 from src.domain.observations import Observation
 from src.repositories.agents import AgentRepository
 from src.repositories.observations import ObservationRepository, ObservationUpsertResult
@@ -10,7 +12,11 @@ from src.application.ports import EventFactorizerPort
 from src.application.services.indicator_snapshot import IndicatorSnapshotBuilder
 
 
-@dataclass
+_UTC = timezone.utc
+_ZERO = timedelta(0)
+
+
+@dataclass(slots=True)
 class GenerateObservationsResult:
     total_agents: int
     total_events: int
@@ -24,11 +30,19 @@ class GenerateObservationsForActiveAgents:
         observations: ObservationRepository,
         factorizer: EventFactorizerPort,
         indicators: Optional[IndicatorSnapshotBuilder] = None,
+        max_concurrency: int = 8,
+        upsert_batch_size: int = 500,
     ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        if upsert_batch_size < 1:
+            raise ValueError("upsert_batch_size must be >= 1")
         self.agents = agents
         self.observations = observations
         self.factorizer = factorizer
         self.indicators = indicators
+        self.max_concurrency = max_concurrency
+        self.upsert_batch_size = upsert_batch_size
         self._log = logging.getLogger(__name__)
 
     def run(
@@ -48,48 +62,112 @@ class GenerateObservationsForActiveAgents:
         self._log.info("GenerateObs: listing active agents")
         active_agents = self.agents.list_active()
         self._log.info("GenerateObs: active agents fetched", extra={"count": len(active_agents)})
-        observations: List[Observation] = []
-        total_events = 0
+        # One events query for all agents; roles come with the profiles loaded by list_active
+        events_by_agent = self.agents.get_events_for_agents(
+            agent_ids=[a.agent_id for a in active_agents],
+            window_start=window_start,
+            window_end=window_end,
+            limit=per_agent_limit,
+        )
 
+        # Collect (agent_id, role, event) jobs
+        jobs: List[Tuple[str, str, Event]] = []
+        add_job = jobs.append
         for a in active_agents:
-            role = self.agents.get_agent_role(a.agent_id) or ""
-            events = self.agents.get_agent_events(
-                agent_id=a.agent_id,
-                window_start=window_start,
-                window_end=window_end,
-                limit=per_agent_limit,
-            )
+            role = (a.coverage_profile_key.role or "").strip()
+            events = events_by_agent.get(a.agent_id, [])
             self._log.info("GenerateObs: events fetched for agent", extra={"agent_id": a.agent_id, "count": len(events)})
-            # get_agent_events already returns only events with assets
+            # get_events_for_agents already returns only events with assets
+            agent_id = a.agent_id
             for e in events:
-                total_events += 1
-                indicators_context = None
-                if self.indicators is not None and e.asset is not None:
-                    try:
-                        indicators_context = self.indicators.build(asset=e.asset, at=e.occurred_at).text
-                    except Exception:
-                        indicators_context = None
-
-                res = self.factorizer.factorize(
-                    event=e,
+                add_job((agent_id, role, e))
+
+        # Indicator snapshots depend only on (asset, occurred_at): build each distinct pair once
+        snapshots = (
+            self.indicators.build_many((e.asset, e.occurred_at) for _, _, e in jobs if e.asset is not None)
+            if self.indicators is not None
+            else {}
+        )
+
+        def indicators_context(e: Event) -> Optional[str]:
+            if e.asset is None:
+                return None
+            snap = snapshots.get((e.asset.symbol, e.occurred_at))
+            return snap.text if snap is not None else None
+
+        total_events = len(jobs)
+
+        # Agents sharing a role see the same prompt for the same event: factorize each
+        # distinct (event, role, indicators) prompt once and fan the result out
+        prompts: Dict[Tuple[str, str, Optional[str]], List[Tuple[str, Event]]] = {}
+        for agent_id, role, e in jobs:
+            prompts.setdefault((e.event_id, role, indicators_context(e)), []).append((agent_id, e))
+
+        # LLM calls are independent and network-bound: run them on a bounded thread pool
+        call_factorizer = self.factorizer.factorize
+
+        def factorize(item: Tuple[Tuple[str, str, Optional[str]], List[Tuple[str, Event]]]) -> Optional[List[Observation]]:
+            (event_id, role, context), targets = item
+            try:
+                res = call_factorizer(
+                    event=targets[0][1],
                     max_tokens=max_tokens,
                     agent_role=role,
-                    indicators_context=indicators_context,
+                    indicators_context=context,
                 )
-                observations.append(
-                    Observation(
-                        agent_id=a.agent_id,
-                        event_id=e.event_id,
-                        asset_symbol=(e.asset.symbol if e.asset else None),
-                        factor=res.factor or "",
-                        zi_score=res.zi_score,
-                        confidence=getattr(res, 'confidence', None),
-                    )
+            except Exception as e:
+                # One failed prompt must not abort the pool: the other calls are already
+                # queued (and paid for) and earlier batches are already written
+                self._log.warning("GenerateObs: factorize failed", extra={"event_id": event_id, "role": role, "error": str(e)})
+                return None
+            factor = res.factor or ""
+            zi_score = res.zi_score
+            confidence = getattr(res, 'confidence', None)
+            return [
+                Observation(
+                    agent_id=agent_id,
+                    event_id=e.event_id,
+                    asset_symbol=(e.asset.symbol if e.asset else None),
+                    factor=factor,
+                    zi_score=zi_score,
+                    confidence=confidence,
                 )
+                for agent_id, e in targets
+            ]
+
+        # Upsert in batches as results arrive so writes overlap the remaining LLM calls
+        # and each upsert stays small
+        observations: List[Observation] = []
+        batch: List[Observation] = []
+        inserted = 0
+        updated = 0
+        failed = 0
+
+        def flush() -> None:
+            nonlocal inserted, updated
+            self._log.info("GenerateObs: upserting observations", extra={"count": len(batch)})
+            res = self.observations.upsert_many(batch)
+            inserted += res.inserted
+            updated += res.updated
+            observations.extend(batch)
+            batch.clear()
+
+        if prompts:
+            workers = min(self.max_concurrency, len(prompts))
+            self._log.info("GenerateObs: factorizing events", extra={"count": len(jobs), "prompts": len(prompts), "workers": workers})
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for obs in pool.map(factorize, prompts.items()):
+                    if obs is None:
+                        failed += 1
+                        continue
+                    batch.extend(obs)
+                    if len(batch) >= self.upsert_batch_size:
+                        flush()
+            if batch:
+                flush()
 
-        self._log.info("GenerateObs: upserting observations", extra={"count": len(observations)})
-        upserted = self.observations.upsert_many(observations)
-        self._log.info("GenerateObs: upsert completed", extra={"inserted": upserted.inserted, "updated": upserted.updated})
+        upserted = ObservationUpsertResult(inserted=inserted, updated=updated, observations=observations)
+        self._log.info("GenerateObs: upsert completed", extra={"inserted": upserted.inserted, "updated": upserted.updated, "failed_prompts": failed})
         return GenerateObservationsResult(
             total_agents=len(active_agents),
             total_events=total_events,
@@ -97,5 +175,5 @@ class GenerateObservationsForActiveAgents:
         )
 
     def _require_utc(self, dt: datetime, name: str) -> None:
-        if dt.tzinfo is None or dt.utcoffset() != timedelta(0):
+        if dt.tzinfo is None or (dt.tzinfo is not _UTC and dt.utcoffset() != _ZERO):
             raise ValueError(f"{name} must be timezone-aware UTC")
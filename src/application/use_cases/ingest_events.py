@@ -1,26 +1,67 @@
-from typing import List
+from typing import AbstractSet, Iterable, Iterator, List
 import logging
 from datetime import datetime
 from src.domain.events import Event
-from src.application.ports import NewsFeedPort
+from src.application.ports import NewsFeedPort, NewsItemDTO
 from src.repositories.events import EventRepository, UpsertResult
 from src.repositories.assets import AssetRepository
 from src.application.services.asset_extractor import AssetExtractor
 from src.domain.assets import Asset
 
 class IngestEvents:
-    def __init__(self, feed: NewsFeedPort, events: EventRepository, assets: AssetRepository):
+    def __init__(self, feed: NewsFeedPort, events: EventRepository, assets: AssetRepository, upsert_batch_size: int = 500):
+        if upsert_batch_size < 1:
+            raise ValueError("upsert_batch_size must be >= 1")
         self.feed = feed
         self.events = events
-        self._asset_extractor = AssetExtractor.from_repository(assets)
+        self.assets = assets
+        self.upsert_batch_size = upsert_batch_size
+        self._symbols: AbstractSet[str] = frozenset()
+        self._asset_extractor = AssetExtractor(known_symbols=set())
         self._log = logging.getLogger(__name__)
     
-    def run(self, limit: int = 10, categories: List[str] | None = None, until: datetime | None = None) -> UpsertResult:
-        self._log.info("IngestEvents: fetching items", extra={"limit": limit, "categories": categories or [], "until": until.isoformat() if until else None})
-        items = list(self.feed.fetch(limit=limit, categories=categories or [], until=until))
+    def run(self, limit: int = 10, categories: Iterable[str] | None = None, until: datetime | None = None) -> UpsertResult:
+        self._refresh_extractor()
+        cats = tuple(categories or ())
+        self._log.info("IngestEvents: fetching items", extra={"limit": limit, "categories": cats, "until": until.isoformat() if until else None})
+        items = list(self.feed.fetch(limit=limit, categories=cats, until=until))
         self._log.info("IngestEvents: items fetched", extra={"count": len(items)})
-        to_upsert: List[Event] = []
 
+        # Upsert in bounded batches instead of materialising every (event x symbol) row
+        upserted: List[Event] = []
+        batch: List[Event] = []
+        inserted = 0
+        updated = 0
+
+        def flush() -> None:
+            nonlocal inserted, updated
+            self._log.info("IngestEvents: upserting events", extra={"count": len(batch)})
+            res = self.events.upsert_many(events=batch)
+            inserted += res.inserted
+            updated += res.updated
+            upserted.extend(batch)
+            batch.clear()
+
+        for event in self._iter_events(items):
+            batch.append(event)
+            if len(batch) >= self.upsert_batch_size:
+                flush()
+        if batch:
+            flush()
+
+        self._log.info("IngestEvents: upsert completed", extra={"inserted": inserted, "updated": updated})
+        return UpsertResult(inserted=inserted, updated=updated, events=upserted)
+
+    def _refresh_extractor(self) -> None:
+        # The use case lives across cron ticks: pick up assets added since the last run
+        symbols = self.assets.list_symbols()
+        if symbols is self._symbols or symbols == self._symbols:
+            return
+        self._symbols = symbols
+        self._asset_extractor = AssetExtractor(known_symbols=set(symbols))
+        self._log.info("IngestEvents: asset symbols loaded", extra={"count": len(symbols)})
+
+    def _iter_events(self, items: Iterable[NewsItemDTO]) -> Iterator[Event]:
         for dto in items:
             # Build a validated base event (ensures UTC and trimmed fields)
             base_event = Event.from_dto(
@@ -37,30 +78,26 @@ class IngestEvents:
 
             if not symbols:
                 # No assets detected: keep original event as-is
-                to_upsert.append(base_event)
+                yield base_event
                 continue
 
             # Duplicate the event per asset with ID like "source:external_id:ASSET"
             # Also ensure the asset symbol is present in categories (uppercase)
-            base_cats_upper = [(c or "").strip().upper() for c in (base_event.categories or []) if (c or "").strip()]
+            # Event.from_dto already trimmed and uppercased the categories
+            base_cats_upper = base_event.categories
+            base_cats_set = frozenset(base_cats_upper)
             for sym in symbols:
                 sym_up = (sym or "").strip().upper()
-                cats = list(base_cats_upper)
-                if sym_up and sym_up not in cats:
-                    cats.append(sym_up)
+                if sym_up and sym_up not in base_cats_set:
+                    cats = [*base_cats_upper, sym_up]
+                else:
+                    cats = list(base_cats_upper)
 
-                to_upsert.append(
-                    Event(
-                        event_id=f"{dto.source}:{dto.external_id}:{sym_up}",
-                        occurred_at=base_event.occurred_at,
-                        title=base_event.title,
-                        content=base_event.content,
-                        categories=cats,
-                        asset=Asset(symbol=sym_up),
-                    )
+                yield Event(
+                    event_id=f"{dto.source}:{dto.external_id}:{sym_up}",
+                    occurred_at=base_event.occurred_at,
+                    title=base_event.title,
+                    content=base_event.content,
+                    categories=cats,
+                    asset=Asset(symbol=sym_up),
                 )
-
-        self._log.info("IngestEvents: upserting events", extra={"count": len(to_upsert)})
-        res = self.events.upsert_many(events=to_upsert)
-        self._log.info("IngestEvents: upsert completed", extra={"inserted": res.inserted, "updated": res.updated})
-        return res
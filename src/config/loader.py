@@ -2,20 +2,33 @@ from __future__ import annotations
 
 import os
 import json
-from typing import Any, Dict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 
 
 def load_base_config(path: str = "config/base.yaml") -> Dict[str, Any]:
     """Load configuration from YAML. If PyYAML is not installed, attempt JSON; otherwise return {}.
 
     Returns an empty dict if file is missing or cannot be parsed.
+    The parsed result is cached per (path, mtime), so repeated calls only re-read
+    the file after it changes. Treat the returned dict as read-only.
     """
-    if not os.path.exists(path):
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
         return {}
+    return _load_config_file(path, mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
     try:
         import yaml  
+        # Prefer the libyaml-backed loader when available
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         with open(path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=loader) or {}
             if not isinstance(data, dict):
                 return {}
             return data
@@ -35,17 +48,85 @@ def conf_get(obj: Dict[str, Any] | None, path: str, default: Any = None) -> Any:
     """Deep get from config dict using dot-separated path."""
     if not obj:
         return default
+    if '.' not in path:
+        # Single key: one dict lookup, no path walk
+        return obj.get(path, default) if isinstance(obj, dict) else default
     cur: Any = obj
-    for part in path.split('.'):
+    for part in _split_path(path):
         if not isinstance(cur, dict) or part not in cur:
             return default
         cur = cur[part]
     return cur
 
 
+@lru_cache(maxsize=256)
+def _split_path(path: str) -> Tuple[str, ...]:
+    return tuple(path.split('.'))
+
+
 def env_or_value(env_name: str | None, value: Any | None, default: Any | None = None) -> Any:
     if env_name:
-        v = os.environ.get(env_name)
+        v = _read_env(env_name)
         if v is not None:
             return v
-    return value if value is not None else default
\ No newline at end of file
+    return value if value is not None else default
+
+
+@lru_cache(maxsize=None)
+def _read_env(env_name: str) -> str | None:
+    """Read an environment variable once per process; later changes are not picked up."""
+    return os.environ.get(env_name)
+
+
+@dataclass(slots=True, frozen=True)
+class Settings:
+    """Typed pipeline settings, resolved from the config dict once."""
+
+    gen_per_agent_limit: Optional[int]
+    gen_max_tokens: int
+    ingest_categories: Tuple[str, ...]
+    ind_timeframe: str
+    ind_rsi_period: int
+    ind_sma_fast: int
+    ind_sma_slow: int
+    min_events_per_round: int
+    backfill_n_rounds: int
+    backfill_timeframe: str
+    ingest_limit: int
+    quote: str
+    eager_first_run: bool
+    jitter_seconds: int
+
+    @classmethod
+    def from_conf(cls, conf: Dict[str, Any]) -> "Settings":
+        per_agent_limit = conf_get(conf, "generation.per_agent_limit", None)
+        return cls(
+            gen_per_agent_limit=(int(per_agent_limit) if per_agent_limit is not None else None),
+            gen_max_tokens=int(conf_get(conf, "generation.max_tokens", conf_get(conf, "llm.max_tokens", 256))),
+            ingest_categories=tuple(conf_get(conf, "news.categories", []) or ()),
+            ind_timeframe=str(conf_get(conf, "indicators.timeframe", "1h")),
+            ind_rsi_period=int(conf_get(conf, "indicators.rsi_period", 14)),
+            ind_sma_fast=int(conf_get(conf, "indicators.sma_fast", 50)),
+            ind_sma_slow=int(conf_get(conf, "indicators.sma_slow", 200)),
+            min_events_per_round=int(conf_get(conf, "backfill.min_events_per_round", 0)),
+            backfill_n_rounds=int(conf_get(conf, "backfill.n_rounds", 2)),
+            backfill_timeframe=str(conf_get(conf, "backfill.timeframe", "1h")),
+            ingest_limit=int(conf_get(conf, "backfill.ingest_limit", 500)),
+            quote=str(conf_get(conf, "backfill.quote", "USDT")),
+            eager_first_run=bool(conf_get(conf, "cron.eager_first_run", True)),
+            jitter_seconds=int(conf_get(conf, "cron.jitter_seconds", 0) or 0),
+        )
+
+
+def load_settings(path: str = "config/base.yaml") -> Settings:
+    """Typed settings for `path`, cached like `load_base_config` (per path and mtime)."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime_ns = -1
+    return _load_settings(path, mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_settings(path: str, mtime_ns: int) -> Settings:
+    return Settings.from_conf(load_base_config(path))
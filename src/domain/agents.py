@@ -1,14 +1,19 @@
+import sys
 from dataclasses import dataclass
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CoverageProfile:
     profile_key: str
     name: str
     role: str = ""
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Agent:
     agent_id: str
     name: str
     coverage_profile_key: CoverageProfile
-    is_active: bool = True
\ No newline at end of file
+    is_active: bool = True
+
+    def __post_init__(self) -> None:
+        if type(self.agent_id) is str:
+            object.__setattr__(self, "agent_id", sys.intern(self.agent_id))
\ No newline at end of file
@@ -1,10 +1,14 @@
+import sys
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
 
 from src.domain.assets import Asset
 
-@dataclass(frozen=True)
+_UTC = timezone.utc
+_ZERO = timedelta(0)
+
+@dataclass(frozen=True, slots=True)
 class Event:
     event_id: str
     occurred_at: datetime
@@ -13,9 +17,15 @@ class Event:
     categories: List[str]
     asset: Optional[Asset] = None
 
+    def __post_init__(self) -> None:
+        # Interned so repeated set/dict keying in upsert and dedupe paths can short-circuit on identity
+        if type(self.event_id) is str:
+            object.__setattr__(self, "event_id", sys.intern(self.event_id))
+
     @staticmethod
-    def from_dto(external_id: str, published_at: datetime,  categories: list[str], title: str, content: str, source: str)->"Event":
-        if published_at.tzinfo is None or published_at.utcoffset() != timedelta(0):
+    def from_dto(external_id: str, published_at: datetime,  categories: Iterable[str], title: str, content: str, source: str)->"Event":
+        tz = published_at.tzinfo
+        if tz is None or (tz is not _UTC and published_at.utcoffset() != _ZERO):
             raise ValueError("occurred_at must be UTC tz-aware")
         t = (title or "").strip()
         if not t:
@@ -25,6 +35,7 @@ class Event:
             occurred_at=published_at,
             title=t,
             content=(content or "").strip(),
-            categories=categories,
+            # Stored uppercase and trimmed, matching how categories are queried
+            categories=[sys.intern(c) for c in (c.strip().upper() for c in (categories or ()) if c) if c],
             asset=None,
         )
\ No newline at end of file
@@ -1,8 +1,9 @@
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from typing import Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Observation:
     agent_id: str
     event_id: str
@@ -10,4 +11,14 @@ class Observation:
     factor: str = ""
     zi_score: Optional[int] = None
     confidence: Optional[int] = None
-    id: Optional[str] = None
\ No newline at end of file
+    id: Optional[str] = None
+    # Stripped, uppercased asset symbol ("" if missing); derived once at construction
+    normalized_symbol: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Intern ids: observations are grouped/deduped by them and share them with events
+        if type(self.agent_id) is str:
+            object.__setattr__(self, "agent_id", sys.intern(self.agent_id))
+        if type(self.event_id) is str:
+            object.__setattr__(self, "event_id", sys.intern(self.event_id))
+        object.__setattr__(self, "normalized_symbol", (self.asset_symbol or "").strip().upper())
\ No newline at end of file
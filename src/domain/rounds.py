@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Literal
+from typing import Literal, Optional
 
 from src.utils.time import snap_to_interval
 from typing import List
@@ -11,6 +11,9 @@ class Round:
     key: str
     window_start: datetime
     window_end: datetime
+    # UTC epoch seconds of the window bounds, filled in by `snapped`
+    start_bucket: Optional[int] = field(default=None, compare=False)
+    end_bucket: Optional[int] = field(default=None, compare=False)
 
     def snapped(
         self,
@@ -20,7 +23,13 @@ class Round:
     ) -> "Round":
         s = snap_to_interval(self.window_start, freq=timeframe, mode=start_mode)
         e = snap_to_interval(self.window_end, freq=timeframe, mode=end_mode)
-        return Round(key=self.key, window_start=s, window_end=e)
+        return Round(
+            key=self.key,
+            window_start=s,
+            window_end=e,
+            start_bucket=int(s.timestamp()),
+            end_bucket=int(e.timestamp()),
+        )
 
 
 @dataclass(frozen=True)
@@ -1,24 +1,34 @@
 import requests
-from typing import Iterable, List
+from requests.adapters import HTTPAdapter
+from typing import Iterable, Tuple
 from datetime import datetime, timezone
 from src.utils.time import snap_to_interval
 from src.application.ports import NewsFeedPort
 from src.application.ports import NewsItemDTO
+from src.utils.base import parse_json
+
+_HEADERS = {"Content-type": "application/json; charset=UTF-8"}
 
 class CoinDeskClient(NewsFeedPort):
     def __init__(self, api_key:str, base_url: str = "https://data-api.coindesk.com/news/v1/article/list"):
         self.api_key = api_key
         self.base_url = base_url
+        # One keep-alive session per client so repeated fetches reuse the TLS connection.
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
-    def fetch(self,limit:int = 10, categories: List[str] = [], until: datetime | None = None) -> Iterable[NewsItemDTO]:
+    def fetch(self,limit:int = 10, categories: Tuple[str, ...] = (), until: datetime | None = None) -> Iterable[NewsItemDTO]:
         params = {"lang":"EN", "limit":limit, "api_key":self.api_key}
         if until:
             params["to_ts"] = snap_to_interval(dt=until).timestamp()
         else:
             params["to_ts"] = -1
-        if len(categories) > 0:
+        if categories:
             params["categories"] = categories
-        res = requests.get(self.base_url, params=params, headers={"Content-type":"application/json; charset=UTF-8"}).json()
+        # Decode the raw body directly (orjson when installed) rather than via Response.json()
+        res = parse_json(self._session.get(self.base_url, params=params, headers=_HEADERS).content)
         for item in res.get("Data",[]):
             yield NewsItemDTO(
                 external_id=item["ID"],
@@ -26,6 +36,6 @@ class CoinDeskClient(NewsFeedPort):
                 published_at=datetime.fromtimestamp(item["PUBLISHED_ON"], tz=timezone.utc),
                 title=item["TITLE"],
                 content=item["BODY"],
-                categories=[i["CATEGORY"] for i in item["CATEGORY_DATA"]],
+                categories=tuple(i["CATEGORY"] for i in item["CATEGORY_DATA"]),
                 source="coindesk"
             )
\ No newline at end of file
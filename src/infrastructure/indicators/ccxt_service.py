@@ -1,22 +1,90 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 import logging
+import threading
+import time
+
+import numpy as np
+
+try:  # optional: C-level Wilder smoothing for long series; falls back to a scalar loop
+    import pandas as _pd  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    _pd = None
+
+try:  # optional: TA-Lib's C RSI, selected with rsi_backend="talib"
+    import talib as _talib  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    _talib = None
 
 from src.application.ports import IndicatorServicePort, PriceChangeDTO
 from src.domain.assets import Asset
 
 
-@dataclass
+_UTC = timezone.utc
+_ZERO = timedelta(0)
+# Below this many smoothing steps the plain loop beats pandas' per-call overhead
+_RMA_VECTOR_MIN = 256
+# Lower bound when searching for a market's first candle (no spot market predates it)
+_LISTING_SEARCH_FROM_MS = 1_356_998_400_000  # 2013-01-01T00:00:00Z
+# How long a symbol missing after a market reload is trusted to stay missing (seconds)
+_UNKNOWN_SYMBOL_TTL = 3600.0
+
+
+@dataclass(frozen=True, slots=True)
 class _OHLCV:
-    ts_ms: int
-    open: float
-    high: float
-    low: float
-    close: float
-    volume: float
+    """Candles as parallel arrays (struct-of-arrays), sorted ascending by `ts` (ms).
+
+    Indicators read `close` directly as a float64 array; slicing returns views.
+    """
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def from_array(cls, arr: np.ndarray) -> "_OHLCV":
+        """Build from an (n, 6) float array of [ts, open, high, low, close, volume] rows."""
+        return cls(
+            ts=arr[:, 0].astype(np.int64),
+            open=arr[:, 1],
+            high=arr[:, 2],
+            low=arr[:, 3],
+            close=arr[:, 4],
+            volume=arr[:, 5],
+        )
+
+    def take(self, idx) -> "_OHLCV":
+        """Rows at `idx` (a slice gives views, an index array gives copies)."""
+        return _OHLCV(self.ts[idx], self.open[idx], self.high[idx], self.low[idx], self.close[idx], self.volume[idx])
+
+
+_OHLCV_FIELDS = ("ts", "open", "high", "low", "close", "volume")
+_EMPTY_OHLCV = _OHLCV.from_array(np.empty((0, 6), dtype=np.float64))
+
+
+@lru_cache(maxsize=4096)
+def _market_symbol(asset_symbol: Optional[str], quote: str) -> str:
+    """ccxt market symbol (e.g. `BTC/USDT`) for an asset symbol and quote currency."""
+    return f"{(asset_symbol or '').strip().upper()}/{quote.strip().upper()}"
+
+
+@dataclass(slots=True)
+class _Series:
+    """Cached candles for one (symbol, timeframe); every candle in [lo, hi] is closed and known."""
+    lo: int
+    hi: int
+    candles: _OHLCV
+    created: float
 
 
 class CcxtIndicatorService(IndicatorServicePort):
@@ -27,10 +95,42 @@ class CcxtIndicatorService(IndicatorServicePort):
     from the configured exchange. RSI is computed on candle closes, and
     the value returned corresponds to the last fully closed candle at or
     before the given `at` time.
+
+    `rsi_backend="talib"` computes the RSI series with TA-Lib (Wilder's smoothing,
+    seeded like the built-in implementation, so values match); it falls back to
+    the built-in numpy path when TA-Lib is not installed.
     """
 
-    def __init__(self, exchange_id: str = "binance", enable_rate_limit: bool = True) -> None:
+    _rsi_backend = "python"
+
+    def __init__(
+        self,
+        exchange_id: str = "binance",
+        enable_rate_limit: bool = True,
+        ohlcv_cache_size: int = 1024,
+        ohlcv_cache_ttl: float = 300.0,
+        rsi_backend: str = "python",
+    ) -> None:
         self._log = logging.getLogger(__name__)
+        if rsi_backend not in ("python", "talib"):
+            raise ValueError(f"Unknown RSI backend: {rsi_backend}")
+        if rsi_backend == "talib" and _talib is None:
+            self._log.warning("Indicators: TA-Lib not installed, using built-in RSI")
+            rsi_backend = "python"
+        self._rsi_backend = rsi_backend
+        # Closed candles never change, so each (symbol, timeframe) keeps one growing series
+        # with the covered range; requests inside it are served without a network call and
+        # partial overlaps only fetch the missing tail. Series expire after `ohlcv_cache_ttl`.
+        self._ohlcv_cache: "OrderedDict[Tuple[str, str], _Series]" = OrderedDict()
+        self._ohlcv_cache_size = ohlcv_cache_size
+        self._ohlcv_cache_ttl = ohlcv_cache_ttl
+        self._ohlcv_lock = threading.Lock()  # the service may be shared by worker threads
+        # First candle per (symbol, timeframe); found on demand, kept for the session
+        self._listing_cache: Dict[Tuple[str, str], int] = {}
+        # Symbols still missing after a reload -> monotonic time of that reload; a full
+        # `load_markets(True)` is slow, so unknown symbols don't trigger one on every call
+        self._unknown_symbols: Dict[str, float] = {}
+        self._frame_ms_cache: Dict[str, int] = {}
         try:
             import ccxt  # type: ignore
         except Exception as e:  # pragma: no cover - runtime dependency guard
@@ -57,15 +157,12 @@ class CcxtIndicatorService(IndicatorServicePort):
         if period <= 0:
             raise ValueError("period must be positive")
 
-        symbol = market or f"{(asset.symbol or '').strip().upper()}/{quote.strip().upper()}"
-        self._log.info("Indicators: computing RSI", extra={"symbol": symbol, "at": at.isoformat(), "timeframe": timeframe, "period": period})
-        if symbol not in self.exchange.markets:
-            # Attempt a reload in case of initial cache miss
-            self.exchange.load_markets(True)
-            if symbol not in self.exchange.markets:
-                raise ValueError(f"Market symbol not found on exchange: {symbol}")
+        symbol = market or _market_symbol(asset.symbol, quote)
+        if self._log.isEnabledFor(logging.INFO):
+            self._log.info("Indicators: computing RSI", extra={"symbol": symbol, "at": at.isoformat(), "timeframe": timeframe, "period": period})
+        self._validate_symbol(symbol)
 
-        frame_ms = int(self.exchange.parse_timeframe(timeframe) * 1000)
+        frame_ms = self._frame_ms(timeframe)
         if frame_ms <= 0:
             raise ValueError(f"Invalid timeframe: {timeframe}")
 
@@ -79,44 +176,33 @@ class CcxtIndicatorService(IndicatorServicePort):
         since_ms = target_ms - lookback * frame_ms
         limit = lookback + 2  # a little extra
 
-        raw = self.exchange.fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=since_ms, limit=limit)
-        ohlcv = self._normalize_ohlcv(raw)
+        ohlcv = self._fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=since_ms, limit=limit)
         if not ohlcv:
+            self._require_listed(symbol, timeframe, target_ms)
             raise ValueError("No OHLCV data returned")
-        self._log.debug("Indicators: OHLCV fetched", extra={"symbol": symbol, "count": len(ohlcv)})
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug("Indicators: OHLCV fetched", extra={"symbol": symbol, "count": len(ohlcv)})
 
         # Ensure we have the target candle in the set (some exchanges ignore `since` granularity)
-        have_target = any(c.ts_ms == target_ms for c in ohlcv)
+        have_target = self._index_of_ts(ohlcv, target_ms) is not None
         if not have_target:
+            self._require_listed(symbol, timeframe, target_ms)
             # Try fetching one more page forward starting exactly at target to catch boundary behavior
-            more = self.exchange.fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=target_ms, limit=period + 2)
-            extra = self._normalize_ohlcv(more)
-            # Merge and unique by ts
-            by_ts = {c.ts_ms: c for c in ohlcv}
-            for c in extra:
-                by_ts[c.ts_ms] = c
-            ohlcv = [by_ts[k] for k in sorted(by_ts.keys())]
-
-        closes = [c.close for c in ohlcv]
-        timestamps = [c.ts_ms for c in ohlcv]
-        rsi_values = self._rsi_series(closes, period)
-
-        # Map rsi values to timestamps starting from the first index that yields an RSI
-        first_rsi_idx = next((i for i, v in enumerate(rsi_values) if v is not None), None)
-        if first_rsi_idx is None:
-            raise ValueError("Insufficient data to compute RSI")
+            extra = self._fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=target_ms, limit=period + 2)
+            ohlcv = self._merge_ohlcv(ohlcv, extra)
 
-        ts_to_rsi = {timestamps[i]: rsi_values[i] for i in range(first_rsi_idx, len(timestamps)) if rsi_values[i] is not None}
-        if target_ms not in ts_to_rsi:
-            # If target candle missing (e.g., exchange returned future/incomplete candles), take last available before target
-            prior_ts = [ts for ts in ts_to_rsi.keys() if ts <= target_ms]
-            if not prior_ts:
-                raise ValueError("RSI not available for the requested time")
-            closest_ts = max(prior_ts)
-            return float(ts_to_rsi[closest_ts])
-
-        value = float(ts_to_rsi[target_ms])
-        self._log.info("Indicators: RSI computed", extra={"symbol": symbol, "value": value})
+        if len(ohlcv) < period + 1:
+            raise ValueError("Insufficient data to compute RSI")
+        rsi_values = self._rsi_series(ohlcv.close, period)
+
+        # RSI at the target candle, or (e.g. exchange returned future/incomplete candles)
+        # the last candle before it; values start at index `period`
+        idx = int(np.searchsorted(ohlcv.ts, target_ms, side="right")) - 1
+        if idx < period:
+            raise ValueError("RSI not available for the requested time")
+        value = float(rsi_values[idx])
+        if ohlcv.ts[idx] == target_ms and self._log.isEnabledFor(logging.INFO):
+            self._log.info("Indicators: RSI computed", extra={"symbol": symbol, "value": value})
         return value
 
     def get_price_change(
@@ -133,14 +219,12 @@ class CcxtIndicatorService(IndicatorServicePort):
         if end <= start:
             raise ValueError("end must be greater than start")
 
-        symbol = market or f"{(asset.symbol or '').strip().upper()}/{quote.strip().upper()}"
-        self._log.info("Indicators: computing price change", extra={"symbol": symbol, "start": start.isoformat(), "end": end.isoformat(), "timeframe": timeframe})
-        if symbol not in self.exchange.markets:
-            self.exchange.load_markets(True)
-            if symbol not in self.exchange.markets:
-                raise ValueError(f"Market symbol not found on exchange: {symbol}")
+        symbol = market or _market_symbol(asset.symbol, quote)
+        if self._log.isEnabledFor(logging.INFO):
+            self._log.info("Indicators: computing price change", extra={"symbol": symbol, "start": start.isoformat(), "end": end.isoformat(), "timeframe": timeframe})
+        self._validate_symbol(symbol)
 
-        frame_ms = int(self.exchange.parse_timeframe(timeframe) * 1000)
+        frame_ms = self._frame_ms(timeframe)
         if frame_ms <= 0:
             raise ValueError(f"Invalid timeframe: {timeframe}")
 
@@ -154,13 +238,13 @@ class CcxtIndicatorService(IndicatorServicePort):
         padding = 2
         since_ms = max(0, start_target - padding * frame_ms)
         candles_needed = int((end_target - since_ms) // frame_ms) + 2 + padding
-        raw = self.exchange.fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=since_ms, limit=candles_needed)
-        ohlcv = self._normalize_ohlcv(raw)
+        ohlcv = self._fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=since_ms, limit=candles_needed)
 
         # Ensure we have the end candle; if missing, fetch forward starting at end_target
-        if not any(c.ts_ms == end_target for c in ohlcv):
-            more = self.exchange.fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=end_target, limit=3)
-            ohlcv = self._merge_ohlcv(ohlcv, self._normalize_ohlcv(more))
+        if self._index_of_ts(ohlcv, end_target) is None:
+            self._require_listed(symbol, timeframe, end_target)
+            more = self._fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=end_target, limit=3)
+            ohlcv = self._merge_ohlcv(ohlcv, more)
 
         # Find price at or before the target timestamps
         start_point = self._price_at_or_before(ohlcv, start_target)
@@ -183,9 +267,79 @@ class CcxtIndicatorService(IndicatorServicePort):
             abs_change=abs_change,
             pct_change=pct_change,
         )
-        self._log.info("Indicators: price change computed", extra={"symbol": symbol, "pct_change": dto.pct_change})
+        if self._log.isEnabledFor(logging.INFO):
+            self._log.info("Indicators: price change computed", extra={"symbol": symbol, "pct_change": dto.pct_change})
         return dto
 
+    def get_price_changes(
+        self,
+        assets: Iterable[Asset],
+        start: datetime,
+        end: datetime,
+        timeframe: str = "1h",
+        quote: str = "USDT",
+    ) -> Dict[str, PriceChangeDTO]:
+        """Price change per symbol over [start, end]; symbols that cannot be priced are omitted.
+
+        ccxt has no multi-symbol OHLCV call, so this fans out per symbol; the OHLCV cache
+        still dedupes repeated windows.
+        """
+        out: Dict[str, PriceChangeDTO] = {}
+        for asset in assets:
+            sym = (asset.symbol or "").strip().upper()
+            if not sym or sym in out:
+                continue
+            try:
+                out[sym] = self.get_price_change(asset=asset, start=start, end=end, timeframe=timeframe, quote=quote)
+            except Exception as e:
+                if self._log.isEnabledFor(logging.DEBUG):
+                    self._log.debug("Indicators: price change unavailable", extra={"symbol": sym, "error": str(e)})
+        return out
+
+    def supported_symbols(self, assets: Iterable[Asset], quote: str = "USDT") -> set[str]:
+        """Symbols (uppercase) that have a `SYMBOL/QUOTE` market on the exchange.
+
+        Reloads the market list at most once per call, instead of once per failing
+        indicator lookup.
+        """
+        q = quote.strip().upper()
+        wanted = {(a.symbol or "").strip().upper() for a in assets} - {""}
+        missing = {s for s in wanted if f"{s}/{q}" not in self.exchange.markets}
+        if missing and not all(self._known_unknown(f"{s}/{q}") for s in missing):
+            self._reload_markets(f"{s}/{q}" for s in missing)
+            missing = {s for s in missing if f"{s}/{q}" not in self.exchange.markets}
+        return wanted - missing
+
+    def prefetch(
+        self,
+        asset: Asset,
+        at: datetime,
+        timeframe: str = "1h",
+        lookback: int = 200,
+        market: Optional[str] = None,
+        quote: str = "USDT",
+    ) -> None:
+        """Fetch `lookback` candles up to the last closed one at `at` into the OHLCV cache.
+
+        RSI, SMA and SMA cross at the same `at` need nested windows ending at that candle;
+        fetching the widest one first lets the others be served from the cache in one
+        round-trip instead of one per indicator.
+        """
+        self._require_utc(at, "at")
+        if lookback <= 0:
+            raise ValueError("lookback must be positive")
+
+        symbol = market or _market_symbol(asset.symbol, quote)
+        if symbol not in self.exchange.markets:
+            return
+        frame_ms = self._frame_ms(timeframe)
+        t_ms = int(at.timestamp() * 1000)
+        target_ms = ((t_ms - 1) // frame_ms) * frame_ms
+        # Same right edge as the indicator windows (a few candles past the target)
+        self._fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=target_ms - lookback * frame_ms, limit=lookback + 4)
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug("Indicators: OHLCV prefetched", extra={"symbol": symbol, "lookback": lookback})
+
     def get_sma(
         self,
         asset: Asset,
@@ -199,14 +353,12 @@ class CcxtIndicatorService(IndicatorServicePort):
         if period <= 0:
             raise ValueError("period must be positive")
 
-        symbol = market or f"{(asset.symbol or '').strip().upper()}/{quote.strip().upper()}"
-        self._log.info("Indicators: computing SMA", extra={"symbol": symbol, "at": at.isoformat(), "timeframe": timeframe, "period": period})
-        if symbol not in self.exchange.markets:
-            self.exchange.load_markets(True)
-            if symbol not in self.exchange.markets:
-                raise ValueError(f"Market symbol not found on exchange: {symbol}")
+        symbol = market or _market_symbol(asset.symbol, quote)
+        if self._log.isEnabledFor(logging.INFO):
+            self._log.info("Indicators: computing SMA", extra={"symbol": symbol, "at": at.isoformat(), "timeframe": timeframe, "period": period})
+        self._validate_symbol(symbol)
 
-        frame_ms = int(self.exchange.parse_timeframe(timeframe) * 1000)
+        frame_ms = self._frame_ms(timeframe)
         t_ms = int(at.timestamp() * 1000)
         target_ms = ((t_ms - 1) // frame_ms) * frame_ms
 
@@ -214,22 +366,22 @@ class CcxtIndicatorService(IndicatorServicePort):
         since_ms = target_ms - (required - 1) * frame_ms
         limit = required + 2
 
-        raw = self.exchange.fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=since_ms, limit=limit)
-        ohlcv = self._normalize_ohlcv(raw)
-        if not any(c.ts_ms == target_ms for c in ohlcv):
-            more = self.exchange.fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=target_ms, limit=period + 2)
-            ohlcv = self._merge_ohlcv(ohlcv, self._normalize_ohlcv(more))
+        ohlcv = self._fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=since_ms, limit=limit)
+        if self._index_of_ts(ohlcv, target_ms) is None:
+            self._require_listed(symbol, timeframe, target_ms)
+            more = self._fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=target_ms, limit=period + 2)
+            ohlcv = self._merge_ohlcv(ohlcv, more)
 
         idx = self._index_of_ts(ohlcv, target_ms)
         if idx is None or idx + 1 < period:
             raise ValueError("Insufficient data to compute SMA")
 
-        closes = [c.close for c in ohlcv]
-        sma = self._sma_at_index(closes, period, idx)
-        if sma is None:
+        sma = self._sma_at(self._cumsum(ohlcv.close), period, idx)
+        if np.isnan(sma):
             raise ValueError("SMA not available for the requested time")
         value = float(sma)
-        self._log.info("Indicators: SMA computed", extra={"symbol": symbol, "value": value})
+        if self._log.isEnabledFor(logging.INFO):
+            self._log.info("Indicators: SMA computed", extra={"symbol": symbol, "value": value})
         return value
 
     def get_sma_cross(
@@ -250,14 +402,12 @@ class CcxtIndicatorService(IndicatorServicePort):
         if fast_period >= slow_period:
             raise ValueError("fast_period must be less than slow_period")
 
-        symbol = market or f"{(asset.symbol or '').strip().upper()}/{quote.strip().upper()}"
-        self._log.info("Indicators: computing SMA cross", extra={"symbol": symbol, "at": at.isoformat(), "timeframe": timeframe, "fast": fast_period, "slow": slow_period})
-        if symbol not in self.exchange.markets:
-            self.exchange.load_markets(True)
-            if symbol not in self.exchange.markets:
-                raise ValueError(f"Market symbol not found on exchange: {symbol}")
+        symbol = market or _market_symbol(asset.symbol, quote)
+        if self._log.isEnabledFor(logging.INFO):
+            self._log.info("Indicators: computing SMA cross", extra={"symbol": symbol, "at": at.isoformat(), "timeframe": timeframe, "fast": fast_period, "slow": slow_period})
+        self._validate_symbol(symbol)
 
-        frame_ms = int(self.exchange.parse_timeframe(timeframe) * 1000)
+        frame_ms = self._frame_ms(timeframe)
         t_ms = int(at.timestamp() * 1000)
         target_ms = ((t_ms - 1) // frame_ms) * frame_ms
 
@@ -266,23 +416,22 @@ class CcxtIndicatorService(IndicatorServicePort):
         since_ms = target_ms - (required - 1) * frame_ms
         limit = required + 3
 
-        raw = self.exchange.fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=since_ms, limit=limit)
-        ohlcv = self._normalize_ohlcv(raw)
-        if not any(c.ts_ms == target_ms for c in ohlcv):
-            more = self.exchange.fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=target_ms, limit=slow_period + 3)
-            ohlcv = self._merge_ohlcv(ohlcv, self._normalize_ohlcv(more))
+        ohlcv = self._fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=since_ms, limit=limit)
+        if self._index_of_ts(ohlcv, target_ms) is None:
+            self._require_listed(symbol, timeframe, target_ms)
+            more = self._fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=target_ms, limit=slow_period + 3)
+            ohlcv = self._merge_ohlcv(ohlcv, more)
 
         idx = self._index_of_ts(ohlcv, target_ms)
         if idx is None or idx < slow_period:
             raise ValueError("Insufficient data to compute SMA cross")
 
-        closes = [c.close for c in ohlcv]
-        fast_curr = self._sma_at_index(closes, fast_period, idx)
-        slow_curr = self._sma_at_index(closes, slow_period, idx)
-        fast_prev = self._sma_at_index(closes, fast_period, idx - 1)
-        slow_prev = self._sma_at_index(closes, slow_period, idx - 1)
+        # Only four SMA points are needed: read them off one prefix-sum array
+        csum = self._cumsum(ohlcv.close)
+        fast_prev, fast_curr = self._sma_at(csum, fast_period, idx - 1), self._sma_at(csum, fast_period, idx)
+        slow_prev, slow_curr = self._sma_at(csum, slow_period, idx - 1), self._sma_at(csum, slow_period, idx)
 
-        if None in (fast_curr, slow_curr, fast_prev, slow_prev):
+        if np.isnan([fast_curr, slow_curr, fast_prev, slow_prev]).any():
             raise ValueError("Insufficient data to compute SMA cross")
 
         crossed: str | None
@@ -300,91 +449,222 @@ class CcxtIndicatorService(IndicatorServicePort):
             prev_slow=float(slow_prev),
             crossed=crossed,
         )
-        self._log.info("Indicators: SMA cross computed", extra={"symbol": symbol, "crossed": crossed})
+        if self._log.isEnabledFor(logging.INFO):
+            self._log.info("Indicators: SMA cross computed", extra={"symbol": symbol, "crossed": crossed})
         return dto
 
     # --- helpers ---
-    def _normalize_ohlcv(self, rows: List[List[float]]) -> List[_OHLCV]:
-        out: List[_OHLCV] = []
-        for r in rows or []:
-            if not r or len(r) < 6:
-                continue
-            ts, o, h, l, c, v = r[:6]
-            try:
-                out.append(_OHLCV(ts_ms=int(ts), open=float(o), high=float(h), low=float(l), close=float(c), volume=float(v)))
-            except Exception:
-                continue
+    def _frame_ms(self, timeframe: str) -> int:
+        """Candle length in ms; parsed once per timeframe string."""
+        frame_ms = self._frame_ms_cache.get(timeframe)
+        if frame_ms is None:
+            frame_ms = self._frame_ms_cache[timeframe] = int(self.exchange.parse_timeframe(timeframe) * 1000)
+        return frame_ms
+
+    def _validate_symbol(self, symbol: str) -> None:
+        if symbol in self.exchange.markets:
+            return
+        if not self._known_unknown(symbol):
+            # Attempt a reload in case of initial cache miss
+            self._reload_markets((symbol,))
+            if symbol in self.exchange.markets:
+                return
+        raise ValueError(f"Market symbol not found on exchange: {symbol}")
+
+    def _known_unknown(self, symbol: str) -> bool:
+        seen = self._unknown_symbols.get(symbol)
+        return seen is not None and time.monotonic() - seen < _UNKNOWN_SYMBOL_TTL
+
+    def _reload_markets(self, symbols: Iterable[str]) -> None:
+        """Reload markets and remember which of `symbols` are still missing."""
+        self.exchange.load_markets(True)
+        now = time.monotonic()
+        markets = self.exchange.markets
+        for sym in symbols:
+            if sym in markets:
+                self._unknown_symbols.pop(sym, None)
+            else:
+                self._unknown_symbols[sym] = now
+
+    def _fetch_ohlcv(self, symbol: str, timeframe: str, since: int, limit: int) -> _OHLCV:
+        frame_ms = self._frame_ms(timeframe)
+        since = int(since)
+        until = since + (int(limit) - 1) * frame_ms
+        key = (symbol, timeframe)
+        now = time.monotonic()
+        with self._ohlcv_lock:
+            series = self._ohlcv_cache.get(key)
+            if series is not None and now - series.created >= self._ohlcv_cache_ttl:
+                del self._ohlcv_cache[key]
+                series = None
+            if series is not None and series.lo <= since and until <= series.hi:
+                self._ohlcv_cache.move_to_end(key)
+                return self._slice_series(series, since, until)
+            # Starting inside the covered range: only the missing tail needs fetching
+            fetch_since = since
+            if series is not None and series.lo <= since <= series.hi + frame_ms:
+                fetch_since = series.hi + frame_ms
+
+        fetch_limit = (until - fetch_since) // frame_ms + 1
+        raw = self.exchange.fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=fetch_since, limit=fetch_limit)
+        fresh = self._normalize_ohlcv(raw)
+        # A candle is final once its period has ended; the still-open one is never marked covered
+        last_closed = (int(time.time() * 1000) // frame_ms - 1) * frame_ms
+        covered_hi = min(until, last_closed)
+
+        with self._ohlcv_lock:
+            series = self._ohlcv_cache.get(key)
+            if series is not None and fetch_since <= series.hi + frame_ms and covered_hi + frame_ms >= series.lo:
+                candles = self._merge_ohlcv(series.candles, fresh)
+                lo, hi, created = min(series.lo, fetch_since), max(series.hi, covered_hi), series.created
+            else:
+                candles, lo, hi, created = fresh, fetch_since, covered_hi, now
+            merged = _Series(lo=lo, hi=hi, candles=candles, created=created)
+            if hi >= lo:
+                self._ohlcv_cache[key] = merged
+                self._ohlcv_cache.move_to_end(key)
+                while len(self._ohlcv_cache) > self._ohlcv_cache_size:
+                    self._ohlcv_cache.popitem(last=False)
+        return self._slice_series(merged, since, until)
+
+    def _listing_ms(self, symbol: str, timeframe: str) -> int:
+        """Open time of the first candle for `symbol`, cached for the session.
+
+        Most exchanges answer a `since` before the listing with the first candles, which
+        gives the answer in one call; for those that return an empty page instead, the
+        first non-empty `since` is binary-searched.
+        """
+        key = (symbol, timeframe)
+        cached = self._listing_cache.get(key)
+        if cached is not None:
+            return cached
+
+        def first_ts(since: int) -> Optional[int]:
+            rows = self.exchange.fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=since, limit=1)
+            ohlcv = self._normalize_ohlcv(rows)
+            return int(ohlcv.ts[0]) if len(ohlcv) else None
+
+        frame_ms = self._frame_ms(timeframe)
+        listing = first_ts(_LISTING_SEARCH_FROM_MS)
+        if listing is None:
+            lo, hi = _LISTING_SEARCH_FROM_MS, (int(time.time() * 1000) // frame_ms) * frame_ms
+            listing = first_ts(hi)
+            if listing is None:
+                listing = hi + frame_ms  # nothing traded yet
+            else:
+                # Invariant: no data from `lo`, data from `hi`
+                while hi - lo > frame_ms:
+                    mid = lo + ((hi - lo) // 2 // frame_ms) * frame_ms
+                    ts = first_ts(mid)
+                    if ts is None:
+                        lo = mid
+                    else:
+                        hi, listing = mid, ts
+        self._listing_cache[key] = listing
+        self._log.debug("Indicators: listing time found", extra={"symbol": symbol, "listing_ms": listing})
+        return listing
+
+    def _require_listed(self, symbol: str, timeframe: str, target_ms: int) -> None:
+        # Windows before the listing can never fill: fail now rather than refetching
+        if target_ms < self._listing_ms(symbol, timeframe):
+            raise ValueError(f"Insufficient data: {symbol} not listed at the requested time")
+
+    def _slice_series(self, series: _Series, since: int, until: int) -> _OHLCV:
+        ts = series.candles.ts
+        i = int(np.searchsorted(ts, since, side="left"))
+        j = int(np.searchsorted(ts, until, side="right"))
+        return series.candles.take(slice(i, j))
+
+    def _normalize_ohlcv(self, rows: List[List[float]]) -> _OHLCV:
+        rows6 = [r[:6] for r in rows or [] if r and len(r) >= 6]
+        if not rows6:
+            return _EMPTY_OHLCV
+        # ccxt rows are numeric (or None for missing fields, which becomes NaN): one C-level
+        # conversion, then drop incomplete rows by mask
+        arr = np.asarray(rows6, dtype=np.float64)
+        arr = arr[~np.isnan(arr).any(axis=1)]
         # Ensure sorted by timestamp ascending
-        out.sort(key=lambda x: x.ts_ms)
-        return out
+        arr = arr[np.argsort(arr[:, 0], kind="stable")]
+        return _OHLCV.from_array(arr)
 
-    def _rsi_series(self, closes: List[float], period: int) -> List[Optional[float]]:
+    def _rsi_series(self, closes: Sequence[float] | np.ndarray, period: int) -> List[Optional[float]]:
         if len(closes) < period + 1:
             return [None] * len(closes)
+        if self._rsi_backend == "talib":
+            values = _talib.RSI(np.asarray(closes, dtype=np.float64), timeperiod=period)
+            return [None] * period + values[period:].tolist()
 
-        # Price changes
-        changes = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
-        gains = [max(ch, 0.0) for ch in changes]
-        losses = [max(-ch, 0.0) for ch in changes]
-
-        # Wilder's smoothing
-        avg_gain = sum(gains[:period]) / period
-        avg_loss = sum(losses[:period]) / period
+        # Price changes split into gains/losses (aligned: one shorter than closes)
+        changes = np.diff(np.asarray(closes, dtype=np.float64))
+        gains = np.where(changes > 0.0, changes, 0.0)
+        losses = np.where(changes < 0.0, -changes, 0.0)
 
-        rsi: List[Optional[float]] = [None] * len(closes)
+        # Wilder's smoothing, seeded with the simple mean of the first `period` changes
+        avg_gain = _wilder_rma(float(gains[:period].mean()), gains[period:], period)
+        avg_loss = _wilder_rma(float(losses[:period].mean()), losses[period:], period)
 
-        def compute_rsi(ag: float, al: float) -> float:
-            if al == 0:
-                return 100.0
-            rs = ag / al
-            return 100.0 - (100.0 / (1.0 + rs))
+        # RSI = 100 - 100 / (1 + RS); a zero average loss means RSI 100
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = np.where(avg_loss == 0.0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
 
         # First RSI value corresponds to index `period`
-        rsi[period] = compute_rsi(avg_gain, avg_loss)
-
-        for i in range(period + 1, len(closes)):
-            gain = gains[i - 1]  # aligned: gains/losses are one shorter
-            loss = losses[i - 1]
-            avg_gain = (avg_gain * (period - 1) + gain) / period
-            avg_loss = (avg_loss * (period - 1) + loss) / period
-            rsi[i] = compute_rsi(avg_gain, avg_loss)
-
-        return rsi
+        return [None] * period + values.tolist()
 
     def _require_utc(self, dt: datetime, name: str) -> None:
-        if dt.tzinfo is None or dt.utcoffset() != timedelta(0):
+        if dt.tzinfo is None or (dt.tzinfo is not _UTC and dt.utcoffset() != _ZERO):
             raise ValueError(f"{name} must be timezone-aware UTC")
 
-    def _index_of_ts(self, ohlcv: List[_OHLCV], ts_ms: int) -> Optional[int]:
-        for i, c in enumerate(ohlcv):
-            if c.ts_ms == ts_ms:
-                return i
+    def _index_of_ts(self, ohlcv: _OHLCV, ts_ms: int) -> Optional[int]:
+        i = int(np.searchsorted(ohlcv.ts, ts_ms, side="left"))
+        if i < len(ohlcv) and ohlcv.ts[i] == ts_ms:
+            return i
         return None
 
-    def _sma_at_index(self, closes: List[float], period: int, idx: int) -> Optional[float]:
-        if idx + 1 < period:
-            return None
-        start = idx - period + 1
-        window = closes[start : idx + 1]
-        return sum(window) / float(period)
-
-    def _merge_ohlcv(self, a: List[_OHLCV], b: List[_OHLCV]) -> List[_OHLCV]:
-        by_ts = {c.ts_ms: c for c in a}
-        for c in b:
-            by_ts[c.ts_ms] = c
-        out = [by_ts[k] for k in sorted(by_ts.keys())]
+    def _cumsum(self, closes: np.ndarray) -> np.ndarray:
+        """Prefix sums with a leading 0, so sum(closes[i:j]) == csum[j] - csum[i]."""
+        csum = np.empty(len(closes) + 1, dtype=np.float64)
+        csum[0] = 0.0
+        np.cumsum(closes, out=csum[1:])
+        return csum
+
+    def _sma_at(self, csum: np.ndarray, period: int, idx: int) -> float:
+        """SMA of the `period` closes ending at `idx`, in O(1); NaN if not enough history."""
+        if idx < 0 or idx + 1 < period:
+            return float("nan")
+        return float((csum[idx + 1] - csum[idx + 1 - period]) / period)
+
+    def _sma_series(self, closes: np.ndarray, period: int) -> np.ndarray:
+        """Simple moving average aligned to `closes`; NaN where fewer than `period` values exist."""
+        out = np.full(len(closes), np.nan, dtype=np.float64)
+        if len(closes) >= period:
+            csum = self._cumsum(closes)
+            out[period - 1 :] = (csum[period:] - csum[:-period]) / period
         return out
 
-    def _price_at_or_before(self, ohlcv: List[_OHLCV], target_ms: int) -> Optional[tuple[int, float]]:
+    def _merge_ohlcv(self, a: _OHLCV, b: _OHLCV) -> _OHLCV:
+        """Union of both candle sets by timestamp; `b` wins where both have a candle."""
+        both = _OHLCV(*(np.concatenate((getattr(b, f), getattr(a, f))) for f in _OHLCV_FIELDS))
+        # np.unique returns sorted timestamps and the first (i.e. `b`'s) index of each
+        _, first = np.unique(both.ts, return_index=True)
+        return both.take(first)
+
+    def _price_at_or_before(self, ohlcv: _OHLCV, target_ms: int) -> Optional[tuple[int, float]]:
         # Assumes ohlcv is sorted ascending by ts
-        best_ts = None
-        best_close = None
-        for c in ohlcv:
-            if c.ts_ms <= target_ms:
-                best_ts = c.ts_ms
-                best_close = c.close
-            else:
-                break
-        if best_ts is None:
+        i = int(np.searchsorted(ohlcv.ts, target_ms, side="right")) - 1
+        if i < 0:
             return None
-        return best_ts, float(best_close)
+        return int(ohlcv.ts[i]), float(ohlcv.close[i])
+
+def _wilder_rma(seed: float, values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's running average: out[0] = seed, out[i] = (out[i-1] * (period - 1) + values[i-1]) / period."""
+    if _pd is not None and len(values) >= _RMA_VECTOR_MIN:
+        # ewm(adjust=False) is the same recurrence with alpha = 1/period, started at its first value
+        x = np.concatenate(([seed], values))
+        return _pd.Series(x).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+    out = np.empty(len(values) + 1, dtype=np.float64)
+    out[0] = avg = seed
+    k = period - 1
+    for i, v in enumerate(values.tolist(), start=1):
+        avg = (avg * k + v) / period
+        out[i] = avg
+    return out
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Optional
+
+
+class RsiStreamer:
+    """
+    Wilder RSI updated one close at a time.
+
+    Produces the same values as `CcxtIndicatorService._rsi_series` over the same
+    closes: the first value comes with the `period + 1`-th close, and every push
+    after that is O(1).
+    """
+
+    def __init__(self, period: int = 14) -> None:
+        if period <= 0:
+            raise ValueError("period must be positive")
+        self.period = period
+        self._prev_close: Optional[float] = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._seen = 0  # price changes seen so far
+
+    def push(self, close: float) -> Optional[float]:
+        """Add the next close; returns the RSI at it, or None while warming up."""
+        close = float(close)
+        prev, self._prev_close = self._prev_close, close
+        if prev is None:
+            return None
+
+        change = close - prev
+        gain = change if change > 0.0 else 0.0
+        loss = -change if change < 0.0 else 0.0
+        self._seen += 1
+        p = self.period
+        if self._seen <= p:
+            # Seed: simple mean of the first `period` changes
+            self._avg_gain += gain / p
+            self._avg_loss += loss / p
+            if self._seen < p:
+                return None
+        else:
+            self._avg_gain = (self._avg_gain * (p - 1) + gain) / p
+            self._avg_loss = (self._avg_loss * (p - 1) + loss) / p
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self._seen < self.period:
+            return None
+        if self._avg_loss == 0.0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self._avg_gain / self._avg_loss)
+
+
+class SmaStreamer:
+    """Simple moving average updated one close at a time with a running sum (O(1) per push)."""
+
+    def __init__(self, period: int) -> None:
+        if period <= 0:
+            raise ValueError("period must be positive")
+        self.period = period
+        self._window: Deque[float] = deque(maxlen=period)
+        self._sum = 0.0
+
+    def push(self, close: float) -> Optional[float]:
+        """Add the next close; returns the SMA ending at it, or None while warming up."""
+        close = float(close)
+        if len(self._window) == self.period:
+            self._sum -= self._window[0]
+        self._window.append(close)
+        self._sum += close
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if len(self._window) < self.period:
+            return None
+        return self._sum / self.period
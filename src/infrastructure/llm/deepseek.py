@@ -1,35 +1,139 @@
+from collections import OrderedDict
+from functools import lru_cache
+import hashlib
+import importlib.util
 import logging
+import math
+import re
+import threading
+
 from src.application.ports import EventFactorizerPort, EventFactorDTO
 from src.domain.events import Event
 from src.utils.base import extract_json_block
 
+import httpx
 from openai import OpenAI
 
+_BASE_SYSTEM_PROMPT = (
+    "You are an AI assistant that analyzes an event and returns a JSON object. "
+    "Return ONLY a single valid JSON object with exactly three keys: 'factor', 'zi_score', and 'confidence'. "
+    "- 'factor': a concise summary (1–2 sentences) of the driver and its likely effect on the asset's price. Always reference the asset explicitly. "
+    "- 'zi_score': an integer in [-2,-1,0,1,2] indicating expected price impact (2=strong positive, 1=moderate positive, 0=neutral, -1=moderate negative, -2=strong negative). "
+    "- 'confidence': a discrete integer in [0..10] representing how confident you are in your assessment given the agent role and any provided indicators snapshot (0=very uncertain, 10=very certain). "
+    "Calibrate confidence using: directness/relevance to the asset, clarity/magnitude of the driver, source credibility and recency, and alignment/consensus of indicators if provided. Under ambiguity or missing signals, lower confidence. "
+    "Do not include any text outside the JSON."
+)
+
+
+@lru_cache(maxsize=1)
+def _shared_http_client() -> httpx.Client:
+    """One keep-alive connection pool for every DeepseekClient in the process.
+
+    Calls are short and frequent, so reusing warm connections saves a TCP+TLS handshake
+    per request; HTTP/2 is used when the optional `h2` package is installed.
+    """
+    return httpx.Client(
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        limits=httpx.Limits(max_keepalive_connections=64, max_connections=128, keepalive_expiry=300),
+    )
+
+
+@lru_cache(maxsize=64)
+def _system_prompt(agent_role: str | None) -> str:
+    """Base instructions plus the agent role line; roles are few, so this is built once each."""
+    if not agent_role:
+        return _BASE_SYSTEM_PROMPT
+    return f"{_BASE_SYSTEM_PROMPT}\n\nAgent role: {agent_role}"
+
+
+_INT_RE = re.compile(r"-?\d+", re.ASCII)
+
+
+def _coerce_int_in_range(v: object, lo: int, hi: int) -> int | None:
+    """`v` as an int in [lo, hi], or None; integers (the usual LLM output) return at once."""
+    if isinstance(v, int):  # bool included: true/false map to 1/0 as before
+        iv = int(v)
+        return iv if lo <= iv <= hi else None
+    if isinstance(v, str):
+        s = v.strip()
+        if _INT_RE.fullmatch(s):
+            iv = int(s)
+            return iv if lo <= iv <= hi else None
+        try:
+            v = float(s)  # "1.0", "2e0"
+        except ValueError:
+            return None
+    if isinstance(v, float) and math.isfinite(v):
+        iv = int(v)
+        return iv if lo <= iv <= hi else None
+    return None
+
+
 class DeepseekClient(EventFactorizerPort):
-    def __init__(self, model: str, api_key: str, base_url: str = "https://api.deepseek.com"):
+    def __init__(self, model: str, api_key: str, base_url: str = "https://api.deepseek.com", cache_size: int = 1024):
         self.model = model
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.client = OpenAI(api_key=api_key, base_url=base_url, http_client=_shared_http_client())
         self._log = logging.getLogger(__name__)
+        # Identical prompts (retries, backfills) reuse the parsed answer instead of a new call;
+        # LRU-bounded, 0 disables. Shared by the worker threads that call factorize.
+        self._cache: "OrderedDict[str, EventFactorDTO]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
 
     def factorize(self, event: Event, max_tokens: int = 256, agent_role: str | None = None, indicators_context: str | None = None) -> EventFactorDTO:
         self._log.info("LLM: factorize start", extra={"event_id": event.event_id, "asset": (event.asset.symbol if getattr(event, 'asset', None) else None), "max_tokens": max_tokens})
-        system_prompt = (
-            "You are an AI assistant that analyzes an event and returns a JSON object. "
-            "Return ONLY a single valid JSON object with exactly three keys: 'factor', 'zi_score', and 'confidence'. "
-            "- 'factor': a concise summary (1–2 sentences) of the driver and its likely effect on the asset's price. Always reference the asset explicitly. "
-            "- 'zi_score': an integer in [-2,-1,0,1,2] indicating expected price impact (2=strong positive, 1=moderate positive, 0=neutral, -1=moderate negative, -2=strong negative). "
-            "- 'confidence': a discrete integer in [0..10] representing how confident you are in your assessment given the agent role and any provided indicators snapshot (0=very uncertain, 10=very certain). "
-            "Calibrate confidence using: directness/relevance to the asset, clarity/magnitude of the driver, source credibility and recency, and alignment/consensus of indicators if provided. Under ambiguity or missing signals, lower confidence. "
-            "Do not include any text outside the JSON."
+        messages = self._build_messages(event, agent_role=agent_role, indicators_context=indicators_context)
+        key = self._cache_key(messages, max_tokens)
+        cached = self._cache_get(key)
+        if cached is not None:
+            self._log.info("LLM: factorize cache hit", extra={"event_id": event.event_id})
+            return cached
+
+        resp = self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=False,
+            max_tokens=max_tokens
         )
-        # Add agent role and indicators snapshot to the system prompt if provided
-        extra_lines = []
-        if agent_role:
-            extra_lines.append(f"Agent role: {agent_role}")
+
+        content = resp.choices[0].message.content if getattr(resp, "choices", None) else ""
+        result = self._parse_response(content, event.event_id)
+        self._cache_put(key, result)
+        self._log.info("LLM: factorize done", extra={"event_id": event.event_id, "has_factor": bool(result.factor), "zi_score": result.zi_score, "confidence": result.confidence})
+        return result
+
+    def _cache_key(self, messages: list[dict[str, str]], max_tokens: int) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for part in (self.model, *(m["content"] for m in messages), str(max_tokens)):
+            h.update(part.encode())
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _cache_get(self, key: str) -> EventFactorDTO | None:
+        if self._cache_size <= 0:
+            return None
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+            return hit
+
+    def _cache_put(self, key: str, result: EventFactorDTO) -> None:
+        if self._cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    def _build_messages(self, event: Event, agent_role: str | None = None, indicators_context: str | None = None) -> list[dict[str, str]]:
+        system_prompt = _system_prompt(agent_role or None)
         if indicators_context:
-            extra_lines.append(f"Indicators snapshot: {indicators_context}")
-        if extra_lines:
-            system_prompt = system_prompt + "\n\n" + "\n".join(extra_lines)
+            # Role-specific head is cached; the snapshot differs per event so it is appended here
+            sep = "\n" if agent_role else "\n\n"
+            system_prompt = f"{system_prompt}{sep}Indicators snapshot: {indicators_context}"
 
         categories = ", ".join(event.categories or [])
         asset_symbol = event.asset.symbol if getattr(event, "asset", None) else ""
@@ -41,56 +145,29 @@ class DeepseekClient(EventFactorizerPort):
             f"Categories: {categories}\n\n"
             f"Content:\n{event.content}"
         )
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ]
 
-        resp = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            stream=False,
-            max_tokens=max_tokens
-        )
-
-        content = resp.choices[0].message.content if getattr(resp, "choices", None) else ""
+    def _parse_response(self, content: str | None, event_id: str) -> EventFactorDTO:
         parsed = extract_json_block(content)
 
         factor = parsed.get("factor")
-        zi_score = parsed.get("zi_score")
-        confidence = parsed.get("confidence")
+        raw_zi = parsed.get("zi_score")
+        raw_conf = parsed.get("confidence")
 
         if not isinstance(factor, str) or not factor.strip():
-            print("LLM output missing valid 'factor' string")
+            self._log.warning("LLM: factor missing", extra={"event_id": event_id})
             factor = None
 
-        if isinstance(zi_score, (int, float, str)) and str(zi_score).strip() != "":
-            try:
-                zi_score = int(float(zi_score))
-            except Exception:
-                self._log.warning("LLM: zi_score not integer", extra={"event_id": event.event_id, "zi_score": zi_score})
-                zi_score = None
-        else:
-            zi_score = None
-
-        if isinstance(zi_score, int) and (zi_score < -2 or zi_score > 2):
-            self._log.warning("LLM: zi_score out of range", extra={"event_id": event.event_id, "zi_score": zi_score})
-            zi_score = None
-
-        # Parse and bound 'confidence' to [0..10]
-        if isinstance(confidence, (int, float, str)) and str(confidence).strip() != "":
-            try:
-                confidence = int(float(confidence))
-            except Exception:
-                self._log.warning("LLM: confidence not integer", extra={"event_id": event.event_id, "confidence": confidence})
-                confidence = None
-        else:
-            confidence = None
-
-        if isinstance(confidence, int) and (confidence < 0 or confidence > 10):
-            self._log.warning("LLM: confidence out of range", extra={"event_id": event.event_id, "confidence": confidence})
-            confidence = None
-
-        result = EventFactorDTO(factor=(factor or "").strip(), zi_score=zi_score, confidence=confidence)
-        self._log.info("LLM: factorize done", extra={"event_id": event.event_id, "has_factor": bool(result.factor), "zi_score": result.zi_score, "confidence": result.confidence})
-        return result
+        zi_score = _coerce_int_in_range(raw_zi, -2, 2)
+        if zi_score is None and str(raw_zi or "").strip():
+            self._log.warning("LLM: zi_score rejected", extra={"event_id": event_id, "zi_score": raw_zi})
+
+        # 'confidence' is bounded to [0..10]
+        confidence = _coerce_int_in_range(raw_conf, 0, 10)
+        if confidence is None and str(raw_conf or "").strip():
+            self._log.warning("LLM: confidence rejected", extra={"event_id": event_id, "confidence": raw_conf})
+
+        return EventFactorDTO(factor=(factor or "").strip(), zi_score=zi_score, confidence=confidence)
@@ -1,11 +1,15 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from supabase import Client
 from src.domain.agents import Agent, CoverageProfile
 from src.domain.events import Event
-from src.domain.assets import Asset
 from src.repositories.agents import AgentRepository
+from src.infrastructure.repositories.supabase.events import PGRST_EMBED_ERRORS, error_code, event_from_row, iter_rows, norm_cat
+
+_UTC = timezone.utc
+_ZERO = timedelta(0)
+
 
 class SupabaseAgentRepository(AgentRepository):
     def __init__(self, sb_client: Client, agent_table: str = "agents", profile_table: str = "coverage_profiles", events_table: str = "events"):
@@ -13,18 +17,16 @@ class SupabaseAgentRepository(AgentRepository):
         self.agent_table = agent_table
         self.profile_table = profile_table
         self.events_table = events_table
+        # Whether agents can embed their profile (FK on coverage_profile_key); None until first tried
+        self._embed_profile: bool | None = None
         self._log = logging.getLogger(__name__)
 
     def get(self, agent_id: str) -> Optional[Agent]:
-        res = self.sb.table(self.agent_table)\
-            .select("agent_id, name, coverage_profile_key, is_active")\
-            .eq("agent_id", agent_id).execute()
-        rows = res.data or []
-        if not rows:
+        bundle = self._fetch_agent_bundle(agent_id)
+        if bundle is None:
             return None
-        a = rows[0]
-        profile = self._fetch_profile(a["coverage_profile_key"])
-        return self._agent_from_row(a, profile)
+        row, prof_row = bundle
+        return self._agent_from_row(row, self._profile_from_row(prof_row) if prof_row else None)
 
     def list_active(self) -> List[Agent]:
         res = self.sb.table(self.agent_table)\
@@ -40,24 +42,13 @@ class SupabaseAgentRepository(AgentRepository):
         return out
 
     def get_agent_profile(self, agent_id: str) -> Optional[CoverageProfile]:
-        res = self.sb.table(self.agent_table).select("coverage_profile_key").eq("agent_id", agent_id).execute()
-        rows = res.data or []
-        if not rows:
+        bundle = self._fetch_agent_bundle(agent_id)
+        if bundle is None or not bundle[1]:
             return None
-        key = rows[0].get("coverage_profile_key")
-        if not key:
-            return None
-        return self._fetch_profile(key)
+        return self._profile_from_row(bundle[1])
 
     def get_agent_role(self, agent_id: str) -> Optional[str]:
-        res = self.sb.table(self.agent_table).select("coverage_profile_key").eq("agent_id", agent_id).limit(1).execute()
-        rows = res.data or []
-        if not rows:
-            return None
-        key = rows[0].get("coverage_profile_key")
-        if not key:
-            return None
-        prof = self._fetch_profile(key)
+        prof = self.get_agent_profile(agent_id)
         return (prof.role or "").strip() if prof else None
 
     def get_agent_categories(self, agent_id: str) -> List[str]:
@@ -65,21 +56,13 @@ class SupabaseAgentRepository(AgentRepository):
         Note: categories are stored with the coverage profile in the DB,
         but are not part of the domain CoverageProfile anymore.
         """
-        res = self.sb.table(self.agent_table).select("coverage_profile_key").eq("agent_id", agent_id).execute()
-        rows = res.data or []
-        if not rows:
-            return []
-        key = rows[0].get("coverage_profile_key")
-        if not key:
+        bundle = self._fetch_agent_bundle(agent_id)
+        if bundle is None or not bundle[1]:
             return []
-        prof_row = self.sb.table(self.profile_table).select("categories").eq("profile_key", key).limit(1).execute()
-        prof_rows = prof_row.data or []
-        if not prof_rows:
-            return []
-        cats = prof_rows[0].get("categories") or []
+        cats = bundle[1].get("categories") or []
         if isinstance(cats, str):
             cats = [c.strip() for c in cats.split(",") if c.strip()]
-        return [self._norm_cat(c) for c in cats if self._norm_cat(c)]
+        return [c for c in map(norm_cat, cats) if c]
 
     def get_agent_events(
         self,
@@ -88,6 +71,45 @@ class SupabaseAgentRepository(AgentRepository):
         window_end: datetime | None = None,
         limit: int | None = None,
     ) -> List[Event]:
+        events = list(self.iter_agent_events(agent_id, window_start, window_end, limit))
+        self._log.info("AgentRepo: fetched agent events", extra={"agent_id": agent_id, "count": len(events)})
+        return events
+
+    def iter_agent_events(
+        self,
+        agent_id: str,
+        window_start: datetime | None = None,
+        window_end: datetime | None = None,
+        limit: int | None = None,
+    ) -> Iterator[Event]:
+        """Like get_agent_events, but fetched page by page and yielded as they arrive."""
+        self._log.info("AgentRepo: fetching agent events with assets", extra={"agent_id": agent_id, "window_start": window_start.isoformat() if window_start else None, "window_end": window_end.isoformat() if window_end else None, "limit": limit})
+        return self._iter_asset_events(window_start, window_end, limit)
+
+    def get_events_for_agents(
+        self,
+        agent_ids: List[str],
+        window_start: datetime | None = None,
+        window_end: datetime | None = None,
+        limit: int | None = None,
+    ) -> Dict[str, List[Event]]:
+        """Events for several agents in a single query.
+        Events are not scoped per agent in the table, so every agent receives
+        the same (per-agent limited) list.
+        """
+        if not agent_ids:
+            return {}
+        self._log.info("AgentRepo: fetching events for agents", extra={"agents": len(agent_ids), "window_start": window_start.isoformat() if window_start else None, "window_end": window_end.isoformat() if window_end else None, "limit": limit})
+        events = list(self._iter_asset_events(window_start, window_end, limit))
+        self._log.info("AgentRepo: fetched events for agents", extra={"count": len(events)})
+        return {agent_id: list(events) for agent_id in agent_ids}
+
+    def _iter_asset_events(
+        self,
+        window_start: datetime | None,
+        window_end: datetime | None,
+        limit: int | None,
+    ) -> Iterator[Event]:
         if window_start is not None:
             self._require_utc(window_start, "window_start")
         if window_end is not None:
@@ -95,37 +117,65 @@ class SupabaseAgentRepository(AgentRepository):
         if window_start is not None and window_end is not None and window_start > window_end:
             raise ValueError("window_start must be <= window_end")
 
-        q = self.sb.table(self.events_table).select("event_id, occurred_at, title, content, categories, asset_symbol")
-        if window_start is not None:
-            q = q.gte("occurred_at", window_start.isoformat())
-        if window_end is not None:
-            q = q.lt("occurred_at", window_end.isoformat())
-
-        # Only include events that have an associated asset
-        try:
-            q = q.not_.is_("asset_symbol", "null")
-        except Exception:
-            q = q.neq("asset_symbol", None)
-
-        q = q.order("occurred_at", desc=False)
-        if limit is not None:
-            q = q.limit(int(limit))
-
-        self._log.info("AgentRepo: fetching agent events with assets", extra={"agent_id": agent_id, "window_start": window_start.isoformat() if window_start else None, "window_end": window_end.isoformat() if window_end else None, "limit": limit})
-        res = q.execute()
-        rows = (res.data or [])
-        rows = [r for r in rows if (r.get("asset_symbol") or "").strip()]
-        self._log.info("AgentRepo: fetched agent events", extra={"agent_id": agent_id, "count": len(rows)})
-        return [self._event_from_row(r) for r in rows]
-
-    def _fetch_profile(self, key: str) -> Optional[CoverageProfile]:
-        res = self.sb.table(self.profile_table)\
-            .select("profile_key, name, role")\
-            .eq("profile_key", key).execute()
-        rows = res.data or []
-        if not rows:
-            return None
-        return self._profile_from_row(rows[0])
+        def query():
+            q = self.sb.table(self.events_table).select("event_id, occurred_at, title, content, categories, asset_symbol")
+            if window_start is not None:
+                q = q.gte("occurred_at", window_start.isoformat())
+            if window_end is not None:
+                q = q.lt("occurred_at", window_end.isoformat())
+
+            # Only include events that have an associated asset (non-null, non-empty)
+            try:
+                q = q.not_.is_("asset_symbol", "null")
+            except Exception:
+                q = q.neq("asset_symbol", None)
+            q = q.neq("asset_symbol", "")
+            # event_id breaks occurred_at ties so offset pages neither skip nor repeat rows
+            return q.order("occurred_at", desc=False).order("event_id")
+
+        return (event_from_row(r) for r in iter_rows(query, limit))
+
+    def _fetch_agent_bundle(self, agent_id: str) -> Optional[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """(agent row, profile row) for one agent, in one round-trip when possible."""
+        row: Optional[Dict[str, Any]] = None
+        prof_row: Optional[Dict[str, Any]] = None
+        if self._embed_profile is not False:
+            try:
+                # Embed the profile through the coverage_profile_key foreign key
+                res = self.sb.table(self.agent_table)\
+                    .select(f"agent_id, name, coverage_profile_key, is_active, {self.profile_table}(profile_key, name, role, categories)")\
+                    .eq("agent_id", agent_id).limit(1).execute()
+            except Exception as e:
+                # Only a missing relationship is remembered; other errors are not about the schema
+                if error_code(e) not in PGRST_EMBED_ERRORS:
+                    raise
+                self._log.warning("AgentRepo: profile embed unsupported, using two queries", extra={"agent_id": agent_id, "error": str(e)})
+                self._embed_profile = False
+            else:
+                self._embed_profile = True
+                rows = res.data or []
+                if not rows:
+                    return None
+                row = dict(rows[0])
+                prof_row = row.pop(self.profile_table, None)
+                if isinstance(prof_row, list):
+                    prof_row = prof_row[0] if prof_row else None
+
+        if row is None:
+            res = self.sb.table(self.agent_table)\
+                .select("agent_id, name, coverage_profile_key, is_active")\
+                .eq("agent_id", agent_id).limit(1).execute()
+            rows = res.data or []
+            if not rows:
+                return None
+            row = rows[0]
+            key = row.get("coverage_profile_key")
+            if key:
+                prof_rows = self.sb.table(self.profile_table)\
+                    .select("profile_key, name, role, categories")\
+                    .eq("profile_key", key).limit(1).execute().data or []
+                prof_row = prof_rows[0] if prof_rows else None
+        return row, prof_row
 
     def _fetch_profiles(self, keys: List[str]) -> Dict[str, CoverageProfile]:
         if not keys:
@@ -163,25 +213,6 @@ class SupabaseAgentRepository(AgentRepository):
             is_active=bool(row.get("is_active", True)),
         )
 
-    def _event_from_row(self, row: Dict[str, Any]) -> Event:
-        raw_ts = row.get("occurred_at")
-        ts = datetime.fromisoformat(raw_ts.replace("Z", "+00:00")) if isinstance(raw_ts, str) else raw_ts
-        cats = row.get("categories") or []
-        if isinstance(cats, str):
-            cats = [c.strip() for c in cats.split(",") if c.strip()]
-        sym = (row.get("asset_symbol") or "").strip().upper()
-        return Event(
-            event_id=row["event_id"],
-            occurred_at=ts,
-            title=row.get("title") or "",
-            content=row.get("content") or "",
-            categories=cats,
-            asset=(Asset(symbol=sym) if sym else None),
-        )
-
-    def _norm_cat(self, s: str) -> str:
-        return (s or "").strip().upper()
-
     def _require_utc(self, dt: datetime, name: str) -> None:
-        if dt.tzinfo is None or dt.utcoffset() != timedelta(0):
+        if dt.tzinfo is None or (dt.tzinfo is not _UTC and dt.utcoffset() != _ZERO):
             raise ValueError(f"{name} must be timezone-aware UTC")
@@ -1,3 +1,6 @@
+from typing import Dict, FrozenSet
+import time
+
 from supabase import Client
 
 from src.domain.assets import Asset
@@ -5,22 +8,46 @@ from src.repositories.assets import AssetRepository
 
 
 class SupabaseAssetRepository(AssetRepository):
-    def __init__(self, sb_client: Client, table: str = "assets") -> None:
+    def __init__(self, sb_client: Client, table: str = "assets", symbols_ttl: float = 300.0) -> None:
         self.sb = sb_client
         self.table = table
+        # list_symbols result, reused for `symbols_ttl` seconds
+        self.symbols_ttl = symbols_ttl
+        self._symbols: FrozenSet[str] | None = None
+        self._symbols_at = 0.0
+        # Assets change rarely; cache resolved rows for the lifetime of the repository
+        self._assets: Dict[str, Asset] = {}
 
     def get_asset(self, symbol: str) -> Asset:
         sym = (symbol or "").strip().upper()
         if not sym:
             raise ValueError("symbol is required")
 
+        cached = self._assets.get(sym)
+        if cached is not None:
+            return cached
+        if self._symbols_fresh(time.monotonic()):
+            # list_symbols loaded the whole table recently: a miss is known absent
+            raise ValueError(f"Asset not found: {sym}")
+
         res = self.sb.table(self.table).select("symbol").eq("symbol", sym).limit(1).execute()
         rows = res.data or []
         if not rows:
             raise ValueError(f"Asset not found: {sym}")
-        return Asset(symbol=rows[0]["symbol"]) 
+        asset = Asset(symbol=rows[0]["symbol"])
+        self._assets[sym] = asset
+        return asset
 
-    def list_symbols(self) -> set[str]:
+    def list_symbols(self) -> FrozenSet[str]:
+        now = time.monotonic()
+        if self._symbols_fresh(now):
+            return self._symbols
         res = self.sb.table(self.table).select("symbol").execute()
         rows = res.data or []
-        return { (r.get("symbol") or "").strip().upper() for r in rows if (r.get("symbol") or "").strip() }
\ No newline at end of file
+        symbols = frozenset(s for s in ((r.get("symbol") or "").strip().upper() for r in rows) if s)
+        self._assets = {s: Asset(symbol=s) for s in symbols}
+        self._symbols, self._symbols_at = symbols, now
+        return symbols
+
+    def _symbols_fresh(self, now: float) -> bool:
+        return self._symbols is not None and now - self._symbols_at < self.symbols_ttl
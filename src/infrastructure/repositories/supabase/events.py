@@ -1,15 +1,104 @@
-from typing import List, Dict, Any
+from functools import lru_cache
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterator, List
 import logging
+import sys
 from src.domain.events import Event
 from src.domain.assets import Asset
 from src.repositories.events import EventRepository, UpsertResult
+from src.utils.base import chunked
+from src.utils.time import parse_iso_datetime
 from supabase import Client
 from datetime import datetime, timezone, timedelta
 
+_UTC = timezone.utc
+_ZERO = timedelta(0)
+# Rows per request when paging through a select (PostgREST's default max-rows)
+_PAGE_SIZE = 1000
+# Postgres SQLSTATE for a missing operator, e.g. `&&` on a non-array column
+PG_UNDEFINED_FUNCTION = "42883"
+# PostgREST codes for an embed it cannot resolve (no / ambiguous foreign-key relationship)
+PGRST_EMBED_ERRORS = frozenset({"PGRST200", "PGRST201"})
+
+
+def error_code(e: BaseException) -> str | None:
+    """PostgREST error code (or Postgres SQLSTATE it passes through) carried by a client error."""
+    code = getattr(e, "code", None)
+    return str(code) if code is not None else None
+
+
+def iter_rows(make_query: Callable[[], Any], limit: int | None = None, page_size: int = _PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+    """Rows of an ordered select, fetched `page_size` at a time with `.range()`.
+
+    `make_query` must build a fresh query on each call (builders are mutated by
+    `.range()`), and its ordering must be total (end on a unique column) or rows
+    sharing a sort key can be skipped or repeated across pages. Stops at `limit` rows
+    or at the first short page, so `page_size` must not exceed the server's max-rows
+    setting: a capped page would look short and silently end the scan.
+    """
+    offset = 0
+    while limit is None or offset < limit:
+        size = page_size if limit is None else min(page_size, int(limit) - offset)
+        rows = make_query().range(offset, offset + size - 1).execute().data or []
+        yield from rows
+        if len(rows) < size:
+            return
+        offset += size
+
+
+@lru_cache(maxsize=2048)
+def norm_cat(s: str | None) -> str:
+    """Trimmed, uppercased category; the few distinct inputs are served from the cache."""
+    return s.strip().upper() if s else ""
+
+
+def event_from_row(row: Dict[str, Any]) -> Event:
+    """Domain Event from an `events` table row (shared by the repositories that read it)."""
+    raw_ts = row.get("occurred_at")
+    ts = parse_iso_datetime(raw_ts) if isinstance(raw_ts, str) else raw_ts
+    cats = row.get("categories") or []
+    if isinstance(cats, str):
+        cats = [c.strip() for c in cats.split(",") if c.strip()]
+    # Categories and symbols come from a small vocabulary: intern them so the many
+    # events held in memory share one string each instead of a copy per row
+    cats = [sys.intern(c) if type(c) is str else c for c in cats]
+    sym = (row.get("asset_symbol") or "").strip().upper()
+    if sym:
+        sym = sys.intern(sym)
+    return Event(
+        event_id=row["event_id"],
+        occurred_at=ts,
+        title=row.get("title") or "",
+        content=row.get("content") or "",
+        categories=cats,
+        asset=(Asset(symbol=sym) if sym else None),
+    )
+
+
 class SupabaseEventRepository(EventRepository):
-    def __init__(self, sb_client: Client, table: str = "events"):
+    # Columns compared by upsert_many to skip rewriting unchanged rows
+    _PAYLOAD_FIELDS = "event_id, occurred_at, title, content, categories, asset_symbol"
+
+    def __init__(
+        self,
+        sb_client: Client,
+        table: str = "events",
+        batch_size: int = 500,
+        track_known_ids: bool = False,
+        known_ids_horizon: timedelta = timedelta(days=7),
+    ):
         self.sb = sb_client
         self.table = table
+        self.batch_size = batch_size
+        # Long-running processes can keep the ids of recent events in memory (loaded once,
+        # then maintained by upsert_many) so recent ids known to be new skip the existence
+        # probe. Only events within `known_ids_horizon` of now are tracked; older ones are
+        # always probed, which keeps the set bounded as the table grows.
+        self.track_known_ids = track_known_ids
+        self.known_ids_horizon = known_ids_horizon
+        self._known_ids: Dict[str, datetime] | None = None
+        # Whether `categories` supports the array overlap filter; None until first tried
+        self._categories_overlap: bool | None = None
         self._log = logging.getLogger(__name__)
 
     def get_events_by_categories(
@@ -19,9 +108,21 @@ class SupabaseEventRepository(EventRepository):
         window_end: datetime | None = None,
         limit: int | None = None,
     ) -> List[Event]:
-        cats = [self._norm_cat(c) for c in (categories or []) if self._norm_cat(c)]
+        events = list(self.iter_events_by_categories(categories, window_start, window_end, limit))
+        self._log.info("EventsRepo: fetched rows", extra={"count": len(events)})
+        return events
+
+    def iter_events_by_categories(
+        self,
+        categories: List[str],
+        window_start: datetime | None = None,
+        window_end: datetime | None = None,
+        limit: int | None = None,
+    ) -> Iterator[Event]:
+        """Like get_events_by_categories, but fetched page by page and yielded as they arrive."""
+        cats = [c for c in map(norm_cat, categories or []) if c]
         if not cats:
-            return []
+            return
 
         if window_start is not None:
             self._require_utc(window_start, "window_start")
@@ -30,24 +131,42 @@ class SupabaseEventRepository(EventRepository):
         if window_start is not None and window_end is not None and window_start > window_end:
             raise ValueError("window_start must be <= window_end")
 
-        q = self.sb.table(self.table).select("event_id, occurred_at, title, content, categories, asset_symbol")
-        if window_start is not None:
-            q = q.gte("occurred_at", window_start.isoformat())
-        if window_end is not None:
-            q = q.lt("occurred_at", window_end.isoformat())  # [start, end)
+        def query(overlaps: bool):
+            q = self.sb.table(self.table).select("event_id, occurred_at, title, content, categories, asset_symbol")
+            if window_start is not None:
+                q = q.gte("occurred_at", window_start.isoformat())
+            if window_end is not None:
+                q = q.lt("occurred_at", window_end.isoformat())  # [start, end)
 
-        or_clauses = [f'categories.cs.["{c}"]' for c in cats]
-        q = q.or_(",".join(or_clauses))
-
-        q = q.order("occurred_at", desc=False)
-        if limit is not None:
-            q = q.limit(int(limit))
+            if overlaps:
+                # One `&&` test (a single GIN probe on an array column)
+                q = q.overlaps("categories", cats)
+            else:
+                # JSON column: one containment test per category
+                q = q.or_(",".join(f'categories.cs.["{c}"]' for c in cats))
+            # event_id breaks occurred_at ties so offset pages neither skip nor repeat rows
+            return q.order("occurred_at", desc=False).order("event_id")
 
         self._log.info("EventsRepo: fetching by categories", extra={"cats": cats, "window_start": window_start.isoformat() if window_start else None, "window_end": window_end.isoformat() if window_end else None, "limit": limit})
-        res = q.execute()
-        rows = res.data or []
-        self._log.info("EventsRepo: fetched rows", extra={"count": len(rows)})
-        return [self._event_from_row(r) for r in rows]
+        overlaps = self._categories_overlap is not False
+        rows = iter_rows(lambda: query(overlaps), limit)
+        if self._categories_overlap is None:
+            # The first page tells whether `ov` works on this column
+            try:
+                head = list(islice(rows, 1))
+                self._categories_overlap = True
+            except Exception as e:
+                # `ov` needs an array column; remember that and use per-category filters.
+                # Anything else (network, 5xx) is not about the column: let it surface.
+                if error_code(e) != PG_UNDEFINED_FUNCTION:
+                    raise
+                self._log.info("EventsRepo: array overlap filter unsupported, using containment", extra={"error": str(e)})
+                self._categories_overlap = overlaps = False
+                head = []
+                rows = iter_rows(lambda: query(False), limit)
+            rows = chain(head, rows)
+        for r in rows:
+            yield event_from_row(r)
 
     def count_in_window(
         self,
@@ -85,46 +204,70 @@ class SupabaseEventRepository(EventRepository):
         if not events:
             return UpsertResult(inserted=0, updated=0, events=[])
 
-        rows = [self._row_from_event(e) for e in events]
-        ids  = [r["event_id"] for r in rows]
-
-        existing = self.sb.table(self.table).select("event_id").in_("event_id", ids).execute()
-        existing_ids = {row["event_id"] for row in (existing.data or [])}
-
-        new_rows     = [r for r in rows if r["event_id"] not in existing_ids]
-        update_rows  = [r for r in rows if r["event_id"] in existing_ids]
+        # One timestamp for the whole call rather than a clock read + isoformat per row
+        updated_at = datetime.now(_UTC).isoformat()
+        row_from_event = self._row_from_event
+        rows = [row_from_event(e, updated_at) for e in events]
 
-        inserted = len(new_rows)
-        updated  = len(update_rows)
+        # Per batch: one probe for the stored payloads, then one upsert of only the rows
+        # that are new or changed; re-ingesting unchanged events writes nothing (no
+        # updated_at churn, WAL or index updates). Existing rows count as updated either way.
+        known = None
+        if self.track_known_ids:
+            cutoff = datetime.now(_UTC) - self.known_ids_horizon
+            known = self._load_known_ids(cutoff)
+            # Ids outside the tracked horizon may exist without being in `known`
+            must_probe = {e.event_id for e in events if e.event_id in known or e.occurred_at < cutoff}
+        inserted = 0
+        updated = 0
+        for batch in chunked(rows, self.batch_size):
+            ids = [r["event_id"] for r in batch]
+            probe_ids = ids if known is None else [i for i in ids if i in must_probe]
+            stored: Dict[str, Dict[str, Any]] = {}
+            if probe_ids:
+                existing = self.sb.table(self.table).select(self._PAYLOAD_FIELDS).in_("event_id", probe_ids).execute()
+                stored = {row["event_id"]: row for row in (existing.data or [])}
 
-        if new_rows:
-            self.sb.table(self.table).insert(new_rows).execute()
+            changed = [r for r in batch if not self._same_payload(stored.get(r["event_id"]), r)]
+            if changed:
+                self.sb.table(self.table).upsert(changed, on_conflict="event_id").execute()
 
-        if update_rows:
-            self.sb.table(self.table).upsert(update_rows, on_conflict="event_id").execute()
+            n_existing = sum(1 for i in ids if i in stored)
+            updated += n_existing
+            inserted += len(batch) - n_existing
+        if known is not None:
+            known.update((e.event_id, e.occurred_at) for e in events if e.occurred_at >= cutoff)
         self._log.info("EventsRepo: upsert_many completed", extra={"inserted": inserted, "updated": updated})
         return UpsertResult(inserted=inserted, updated=updated, events=events)
 
-    def _norm_cat(self, s: str) -> str:
-        return (s or "").strip().upper()
-
-    def _event_from_row(self, row: Dict[str, Any]) -> Event:
-        raw_ts = row.get("occurred_at")
-        ts = datetime.fromisoformat(raw_ts.replace("Z", "+00:00")) if isinstance(raw_ts, str) else raw_ts
-        cats = row.get("categories") or []
-        if isinstance(cats, str):
-            cats = [c.strip() for c in cats.split(",") if c.strip()]
-        sym = (row.get("asset_symbol") or "").strip().upper()
-        return Event(
-            event_id=row["event_id"],
-            occurred_at=ts,
-            title=row.get("title") or "",
-            content=row.get("content") or "",
-            categories=cats,
-            asset=(Asset(symbol=sym) if sym else None),
-        )
-
-    def _row_from_event(self, e: Event) -> Dict[str, Any]:
+    def _load_known_ids(self, cutoff: datetime) -> Dict[str, datetime]:
+        """Ids (with occurred_at) of stored events at or after `cutoff`; loaded once, then pruned."""
+        if self._known_ids is None:
+            self._log.info("EventsRepo: loading known event ids", extra={"since": cutoff.isoformat()})
+            query = lambda: self.sb.table(self.table).select("event_id, occurred_at").gte("occurred_at", cutoff.isoformat()).order("event_id")  # noqa: E731
+            self._known_ids = {r["event_id"]: parse_iso_datetime(r["occurred_at"]) for r in iter_rows(query)}
+            self._log.info("EventsRepo: known event ids loaded", extra={"count": len(self._known_ids)})
+        else:
+            expired = [i for i, ts in self._known_ids.items() if ts < cutoff]
+            for i in expired:
+                del self._known_ids[i]
+        return self._known_ids
+
+    def _same_payload(self, stored: Dict[str, Any] | None, row: Dict[str, Any]) -> bool:
+        if stored is None:
+            return False
+        for k in ("title", "content", "asset_symbol"):
+            if (stored.get(k) or None) != (row[k] or None):
+                return False
+        if list(stored.get("categories") or []) != list(row["categories"] or []):
+            return False
+        raw_ts = stored.get("occurred_at")
+        try:
+            return parse_iso_datetime(raw_ts) == parse_iso_datetime(row["occurred_at"])
+        except (TypeError, ValueError):
+            return False
+
+    def _row_from_event(self, e: Event, updated_at: str) -> Dict[str, Any]:
         source, external_id = e.event_id.split(":", 1)
         return {
             "event_id":     e.event_id,
@@ -135,9 +278,9 @@ class SupabaseEventRepository(EventRepository):
             "content":      e.content,
             "categories":   e.categories,
             "asset_symbol": (e.asset.symbol if e.asset else None),
-            "updated_at":   datetime.now(timezone.utc).isoformat()
+            "updated_at":   updated_at
         }
 
     def _require_utc(self, dt: datetime, name: str) -> None:
-        if dt.tzinfo is None or dt.utcoffset() != timedelta(0):
+        if dt.tzinfo is None or (dt.tzinfo is not _UTC and dt.utcoffset() != _ZERO):
             raise ValueError(f"{name} must be timezone-aware UTC")
\ No newline at end of file
@@ -1,17 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import logging
 
 from supabase import Client
 
 from src.domain.observations import Observation
 from src.repositories.observations import ObservationRepository, ObservationUpsertResult
+from src.infrastructure.repositories.supabase.events import PGRST_EMBED_ERRORS, error_code, iter_rows
+from src.utils.base import chunked
+
+# Postgres SQLSTATE for a column the table does not have
+_UNDEFINED_COLUMN = "42703"
+
+
+def _quote(value: str) -> str:
+    """PostgREST filter value, double-quoted so ids containing `:`, `,` or `.` stay intact."""
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
 
 
 class SupabaseObservationRepository(ObservationRepository):
-    def __init__(self, sb_client: Client, table: str = "observations", events_table: str = "events") -> None:
+    # Column sets to try, most specific first (older schemas lack the id / confidence columns)
+    _SELECTS: Tuple[Tuple[Optional[str], bool], ...] = (
+        ("observation_id", True),
+        ("observation_id", False),
+        ("id", True),
+        ("id", False),
+        (None, True),
+        (None, False),
+    )
+    _BASE_FIELDS_WITH_CONF = "agent_id, event_id, asset_symbol, factor, zi_score, confidence"
+    _BASE_FIELDS_NO_CONF = "agent_id, event_id, asset_symbol, factor, zi_score"
+
+    def __init__(
+        self,
+        sb_client: Client,
+        table: str = "observations",
+        events_table: str = "events",
+        batch_size: int = 500,
+        max_concurrency: int = 4,
+        columns: Tuple[Optional[str], bool] | None = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
         self.sb = sb_client
         self.table = table
+        # Postgres gains little from write batches much past ~1k rows; keep bodies bounded
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        # (id column or None, has confidence) of this table; probed against _SELECTS on
+        # first read unless given
+        self._columns: Tuple[Optional[str], bool] | None = columns
+        # Whether observations can embed events (FK on event_id) for a joined window read;
+        # None until first tried
+        self._window_join: bool | None = None
         self.events_table = events_table
         self._log = logging.getLogger(__name__)
 
@@ -19,40 +62,51 @@ class SupabaseObservationRepository(ObservationRepository):
         if not observations:
             return ObservationUpsertResult(inserted=0, updated=0, observations=[])
 
-        rows = [self._row_from_obs(o) for o in observations]
-
-        agent_ids = list({r["agent_id"] for r in rows})
-        event_ids = list({r["event_id"] for r in rows})
-
-        existing = (
-            self.sb
-            .table(self.table)
-            .select("agent_id, event_id, asset_symbol")
-            .in_("agent_id", agent_ids)
-            .in_("event_id", event_ids)
-            .execute()
-        )
-        existing_keys: set[Tuple[str, str, Optional[str]]] = set()
-        for r in (existing.data or []):
-            existing_keys.add((r.get("agent_id"), r.get("event_id"), r.get("asset_symbol")))
-
-        def key_of(row: Dict[str, Any]) -> Tuple[str, str, Optional[str]]:
-            return (row["agent_id"], row["event_id"], row.get("asset_symbol"))
-
-        new_rows = [r for r in rows if key_of(r) not in existing_keys]
-        update_rows = [r for r in rows if key_of(r) in existing_keys]
-
-        inserted = len(new_rows)
-        updated = len(update_rows)
-
-        if new_rows:
-            self.sb.table(self.table).insert(new_rows).execute()
-        if update_rows:
-            self.sb.table(self.table).upsert(update_rows, on_conflict="agent_id,event_id,asset_symbol").execute()
+        # One timestamp for the whole call rather than a clock read + isoformat per row
+        now_iso = datetime.now(timezone.utc).isoformat()
+        rows = [self._row_from_obs(o, now_iso) for o in observations]
+        batches = list(chunked(rows, self.batch_size))
+
+        inserted = 0
+        updated = 0
+        # Batches are independent network round-trips: overlap them
+        workers = min(self.max_concurrency, len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for n_new, n_existing in pool.map(self._upsert_batch, batches):
+                inserted += n_new
+                updated += n_existing
         self._log.info("ObservationsRepo: upsert_many", extra={"inserted": inserted, "updated": updated})
         return ObservationUpsertResult(inserted=inserted, updated=updated, observations=observations)
 
-    def _row_from_obs(self, o: Observation) -> Dict[str, Any]:
+    def _upsert_batch(self, batch: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Upsert one batch; returns (inserted, updated)."""
+        # Probe only the (agent_id, event_id) pairs in the batch, not the agents x events
+        # cross product that two independent IN filters would match
+        events_by_agent: Dict[str, set[str]] = {}
+        for r in batch:
+            events_by_agent.setdefault(r["agent_id"], set()).add(r["event_id"])
+
+        q = self.sb.table(self.table).select("agent_id, event_id, asset_symbol")
+        if len(events_by_agent) == 1:
+            [(agent_id, event_ids)] = events_by_agent.items()
+            q = q.eq("agent_id", agent_id).in_("event_id", list(event_ids))
+        else:
+            q = q.or_(",".join(
+                f"and(agent_id.eq.{_quote(agent_id)},event_id.in.({','.join(map(_quote, event_ids))}))"
+                for agent_id, event_ids in events_by_agent.items()
+            ))
+        existing = q.execute()
+        # Keys as one "\x1f"-joined string: a single hash per probe instead of a tuple's
+        existing_keys = frozenset(f"{r.get('agent_id')}\x1f{r.get('event_id')}\x1f{r.get('asset_symbol') or ''}" for r in (existing.data or []))
+
+        n_existing = sum(1 for r in batch if f"{r['agent_id']}\x1f{r['event_id']}\x1f{r.get('asset_symbol') or ''}" in existing_keys)
+
+        # One write for the whole batch: the conflict target classifies rows server-side,
+        # the probe above only feeds the inserted/updated counts
+        self.sb.table(self.table).upsert(batch, on_conflict="agent_id,event_id,asset_symbol").execute()
+        return len(batch) - n_existing, n_existing
+
+    def _row_from_obs(self, o: Observation, now_iso: str) -> Dict[str, Any]:
         return {
             "agent_id": o.agent_id,
             "event_id": o.event_id,
@@ -60,10 +114,15 @@ class SupabaseObservationRepository(ObservationRepository):
             "factor": (o.factor or ""),
             "zi_score": o.zi_score,
             "confidence": o.confidence,
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "updated_at": now_iso,
         }
 
     def list_in_window(self, window_start: datetime, window_end: datetime) -> List[Observation]:
+        out = list(self.iter_in_window(window_start, window_end))
+        self._log.info("ObservationsRepo: fetched observations", extra={"count": len(out)})
+        return out
+
+    def iter_in_window(self, window_start: datetime, window_end: datetime) -> Iterator[Observation]:
         if window_start.tzinfo is None or window_start.utcoffset() is None:
             raise ValueError("window_start must be timezone-aware UTC")
         if window_end.tzinfo is None or window_end.utcoffset() is None:
@@ -72,6 +131,27 @@ class SupabaseObservationRepository(ObservationRepository):
             raise ValueError("window_start must be <= window_end")
 
         self._log.info("ObservationsRepo: listing observations by events window", extra={"start": window_start.isoformat(), "end": window_end.isoformat()})
+        columns = self._resolve_columns()
+        build = self._obs_factory(columns[0])
+        fields = self._fields(*columns)
+
+        if self._window_join is not False:
+            # One paged query filtered on the joined events' occurred_at range, instead of
+            # listing the window's event ids and sending them back as IN filters
+            rows = self._iter_joined_in_window(fields, window_start, window_end)
+            try:
+                head = list(islice(rows, 1))
+                self._window_join = True
+            except Exception as e:
+                # Only a missing relationship switches paths for good; other errors surface
+                if error_code(e) not in PGRST_EMBED_ERRORS:
+                    raise
+                self._log.info("ObservationsRepo: events embed unsupported, using event id filters", extra={"error": str(e)})
+                self._window_join = False
+            else:
+                yield from map(build, chain(head, rows))
+                return
+
         ev = (
             self.sb
             .table(self.events_table)
@@ -79,51 +159,67 @@ class SupabaseObservationRepository(ObservationRepository):
             .gte("occurred_at", window_start.isoformat())
             .lt("occurred_at", window_end.isoformat())
         ).execute()
-        event_ids = [r.get("event_id") for r in (ev.data or []) if r.get("event_id")]
+        # Deduplicated, keeping occurred_at order, so no id is sent twice in the IN filters
+        event_ids = list(dict.fromkeys(eid for r in (ev.data or []) if (eid := r.get("event_id"))))
         if not event_ids:
             self._log.info("ObservationsRepo: no events in window", extra={"start": window_start.isoformat(), "end": window_end.isoformat()})
-            return []
-
-        rows: List[Dict[str, Any]] = []
-        id_field: str | None = None
-        selects = [
-            ("observation_id", True),
-            ("observation_id", False),
-            ("id", True),
-            ("id", False),
-            (None, True),
-            (None, False),
-        ]
-        base_fields_with_conf = "agent_id, event_id, asset_symbol, factor, zi_score, confidence, updated_at"
-        base_fields_no_conf = "agent_id, event_id, asset_symbol, factor, zi_score, updated_at"
-        for id_col, with_conf in selects:
-            fields = base_fields_with_conf if with_conf else base_fields_no_conf
-            if id_col:
-                fields = f"{id_col}, " + fields
-            try:
-                res = (
-                    self.sb
-                    .table(self.table)
-                    .select(fields)
-                    .in_("event_id", event_ids)
-                ).execute()
-                rows = res.data or []
-                id_field = id_col
-                break
-            except Exception:
-                continue
-        self._log.info("ObservationsRepo: fetched observations", extra={"count": len(rows)})
-        out: List[Observation] = []
-        for r in rows:
-            out.append(
-                Observation(
-                    id=(str(r.get(id_field)) if id_field and r.get(id_field) is not None else None),
-                    agent_id=r.get("agent_id"),
-                    event_id=r.get("event_id"),
-                    asset_symbol=r.get("asset_symbol"),
-                    factor=r.get("factor") or "",
-                    zi_score=r.get("zi_score"),
-                    confidence=r.get("confidence"),
-                )
+            return
+
+        # Fetch observations one event chunk at a time so callers can consume rows
+        # as they arrive instead of waiting for (and holding) the whole window
+        for batch in chunked(event_ids, self.batch_size):
+            res = self.sb.table(self.table).select(fields).in_("event_id", batch).execute()
+            yield from map(build, res.data or [])
+
+    def _iter_joined_in_window(self, fields: str, window_start: datetime, window_end: datetime) -> Iterator[Dict[str, Any]]:
+        fields = f"{fields}, {self.events_table}!inner(occurred_at)"
+
+        def query():
+            return (
+                self.sb
+                .table(self.table)
+                .select(fields)
+                .gte(f"{self.events_table}.occurred_at", window_start.isoformat())
+                .lt(f"{self.events_table}.occurred_at", window_end.isoformat())
+                .order("event_id")
+                .order("agent_id")
+                .order("asset_symbol")
             )
-        return out
\ No newline at end of file
+
+        return iter_rows(query)
+
+    def _obs_factory(self, id_field: Optional[str]) -> Callable[[Dict[str, Any]], Observation]:
+        """Row -> Observation builder for one column set, bound once per read."""
+        make = Observation
+        # Positional, so field-order-sensitive: agent_id, event_id, asset_symbol, factor,
+        # zi_score, confidence, id. Base columns are always selected; confidence may be absent.
+        if id_field is None:
+            def build(r: Dict[str, Any]) -> Observation:
+                return make(r["agent_id"], r["event_id"], r["asset_symbol"], r["factor"] or "", r["zi_score"], r.get("confidence"))
+        else:
+            def build(r: Dict[str, Any]) -> Observation:
+                obs_id = r.get(id_field)
+                return make(r["agent_id"], r["event_id"], r["asset_symbol"], r["factor"] or "", r["zi_score"], r.get("confidence"), None if obs_id is None else str(obs_id))
+        return build
+
+    def _resolve_columns(self) -> Tuple[Optional[str], bool]:
+        """The first _SELECTS entry the table accepts, probed once with empty selects and kept."""
+        if self._columns is None:
+            for id_col, with_conf in self._SELECTS:
+                try:
+                    self.sb.table(self.table).select(self._fields(id_col, with_conf)).limit(0).execute()
+                except Exception as e:
+                    # Only a missing column means "try a narrower set"; a timeout or 5xx
+                    # must not be cached as a schema without ids or confidence
+                    if error_code(e) != _UNDEFINED_COLUMN:
+                        raise
+                    continue
+                self._columns = (id_col, with_conf)
+                break
+            else:
+                raise ValueError(f"table {self.table!r} lacks the base observation columns")
+        return self._columns
+
+    def _fields(self, id_col: Optional[str], with_conf: bool) -> str:
+        fields = self._BASE_FIELDS_WITH_CONF if with_conf else self._BASE_FIELDS_NO_CONF
+        return f"{id_col}, {fields}" if id_col else fields
@@ -1,11 +1,18 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 import logging
 
 from supabase import Client
 
 from src.domain.rounds import  RoundEvaluation
 from src.repositories.rounds import RoundRepository, SaveRoundResult
+from src.infrastructure.repositories.supabase.events import PGRST_EMBED_ERRORS, error_code
+from src.utils.base import chunked
+
+# Ids per `in.(...)` filter / rows per write, keeping URLs and bodies bounded
+_BATCH_SIZE = 500
+# Postgres SQLSTATE for a duplicate key, surfaced as the PostgREST error code
+_UNIQUE_VIOLATION = "23505"
 
 
 class SupabaseRoundRepository(RoundRepository):
@@ -13,28 +20,30 @@ class SupabaseRoundRepository(RoundRepository):
         self.sb = sb_client
         self.rounds_table = rounds_table
         self.scores_table = scores_table
+        # Whether rounds can embed round_scores (FK on round_key); None until first tried
+        self._scores_embed: bool | None = None
         self._log = logging.getLogger(__name__)
 
     def save_evaluation(self, evaluation: RoundEvaluation) -> SaveRoundResult:
         rnd = evaluation.round
-        is_insert = True
-        try:
-            exists = self.sb.table(self.rounds_table).select("key").eq("key", rnd.key).limit(1).execute()
-            is_insert = not bool(exists.data)
-        except Exception as e:
-            self._log.warning("RoundsRepo: round existence check failed", extra={"key": rnd.key, "error": str(e)})
-
-        self._log.info("RoundsRepo: saving round", extra={"key": rnd.key, "window_start": rnd.window_start.isoformat(), "window_end": rnd.window_end.isoformat(), "new": is_insert})
+        self._log.info("RoundsRepo: saving round", extra={"key": rnd.key, "window_start": rnd.window_start.isoformat(), "window_end": rnd.window_end.isoformat()})
+        now_iso = datetime.now(timezone.utc).isoformat()
         payload = {
             "key": rnd.key,
             "window_start": rnd.window_start.isoformat(),
             "window_end": rnd.window_end.isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "updated_at": now_iso,
         }
+        # Insert first: new rounds (the common case) take one round-trip, and a key
+        # conflict both tells us the round exists and falls through to the update
+        is_insert = True
         try:
-            if is_insert:
+            try:
                 self.sb.table(self.rounds_table).insert(payload).execute()
-            else:
+            except Exception as e:
+                if error_code(e) != _UNIQUE_VIOLATION:
+                    raise
+                is_insert = False
                 self.sb.table(self.rounds_table).update(payload).eq("key", rnd.key).execute()
         except Exception as e:
             self._log.warning("RoundsRepo: round save failed", extra={"key": rnd.key, "error": str(e)})
@@ -45,7 +54,7 @@ class SupabaseRoundRepository(RoundRepository):
                 "agent_id": s.agent_id,
                 "observation_id": s.observation_id,
                 "score": float(s.score),
-                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "updated_at": now_iso,
             }
             for s in (evaluation.agent_scores or [])
         ]
@@ -60,49 +69,68 @@ class SupabaseRoundRepository(RoundRepository):
             )
 
         observation_ids = [r["observation_id"] for r in rows]
-        existing = None
-        existing_keys: set[tuple[str, str]] = set()
+        existing_keys: set[str] = set()  # "round_key\x1fobservation_id"
         try:
-            existing = (
-                self.sb.table(self.scores_table)
-                .select("round_key, observation_id")
-                .eq("round_key", rnd.key)
-                .in_("observation_id", observation_ids)
-                .execute()
-            )
-            existing_keys = {(r.get("round_key"), str(r.get("observation_id"))) for r in (existing.data or [])}
+            for ids in chunked(observation_ids, _BATCH_SIZE):
+                existing = (
+                    self.sb.table(self.scores_table)
+                    .select("round_key, observation_id")
+                    .eq("round_key", rnd.key)
+                    .in_("observation_id", ids)
+                    .execute()
+                )
+                existing_keys.update(f"{r.get('round_key')}\x1f{r.get('observation_id')}" for r in (existing.data or []))
         except Exception as e:
             self._log.warning("RoundsRepo: fetch existing scores failed", extra={"round_key": rnd.key, "error": str(e)})
-        key_of = lambda rr: (rr["round_key"], str(rr["observation_id"]))  # noqa: E731
-        inserted_rows = [r for r in rows if key_of(r) not in existing_keys]
-        updated_rows = [r for r in rows if key_of(r) in existing_keys]
+        n_existing = sum(1 for r in rows if f"{r['round_key']}\x1f{r['observation_id']}" in existing_keys)
+        n_new = len(rows) - n_existing
 
         try:
-            if inserted_rows:
-                self.sb.table(self.scores_table).insert(inserted_rows).execute()
-            if updated_rows:
-                # Upsert by (round_key, observation_id)
-                self.sb.table(self.scores_table).upsert(updated_rows, on_conflict="round_key,observation_id").execute()
+            # Upsert by (round_key, observation_id); the probe above only feeds the counts
+            for batch in chunked(rows, _BATCH_SIZE):
+                self.sb.table(self.scores_table).upsert(batch, on_conflict="round_key,observation_id").execute()
         except Exception as e:
             self._log.warning("RoundsRepo: saving scores failed", extra={"round_key": rnd.key, "error": str(e)})
-        self._log.info("RoundsRepo: saved scores", extra={"round_key": rnd.key, "inserted": len(inserted_rows), "updated": len(updated_rows), "total": len(rows)})
+        self._log.info("RoundsRepo: saved scores", extra={"round_key": rnd.key, "new_round": is_insert, "inserted": n_new, "updated": n_existing, "total": len(rows)})
 
         return SaveRoundResult(
             inserted_round=1 if is_insert else 0,
             updated_round=0 if is_insert else 1,
-            inserted_scores=len(inserted_rows),
-            updated_scores=len(updated_rows),
+            inserted_scores=n_new,
+            updated_scores=n_existing,
             total_scores=len(rows),
         )
 
-    def existing_round_keys(self, keys: List[str]) -> set[str]:
-        if not keys:
-            return set()
-        res = (
-            self.sb.table(self.scores_table)
-            .select("round_key")
-            .in_("round_key", keys)
-            .execute()
-        )
-        rows = res.data or []
-        return {r.get("round_key") for r in rows if r.get("round_key")}
\ No newline at end of file
+    def existing_round_keys(self, keys: Iterable[str]) -> set[str]:
+        """Keys of the given rounds that already have at least one saved score."""
+        keys = list(dict.fromkeys(keys))
+        out: set[str] = set()
+        for batch in chunked(keys, _BATCH_SIZE):
+            if self._scores_embed is not False:
+                try:
+                    # One row per round with a single embedded score, rather than every score row
+                    res = (
+                        self.sb.table(self.rounds_table)
+                        .select(f"key, {self.scores_table}!inner(round_key)")
+                        .in_("key", batch)
+                        .limit(1, foreign_table=self.scores_table)
+                        .execute()
+                    )
+                except Exception as e:
+                    # Only a missing relationship switches to the scan for good; other errors surface
+                    if error_code(e) not in PGRST_EMBED_ERRORS:
+                        raise
+                    self._log.info("RoundsRepo: scores embed unsupported, scanning scores", extra={"error": str(e)})
+                    self._scores_embed = False
+                else:
+                    self._scores_embed = True
+                    out.update(r["key"] for r in (res.data or []) if r.get("key"))
+                    continue
+            res = (
+                self.sb.table(self.scores_table)
+                .select("round_key")
+                .in_("round_key", batch)
+                .execute()
+            )
+            out.update(r.get("round_key") for r in (res.data or []) if r.get("round_key"))
+        return out
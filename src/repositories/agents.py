@@ -1,4 +1,4 @@
-from typing import Protocol, Optional, List
+from typing import Iterator, Protocol, Optional, List, Dict
 from datetime import datetime
 from src.domain.agents import Agent, CoverageProfile
 from src.domain.events import Event
@@ -16,6 +16,20 @@ class AgentRepository(Protocol):
         window_end: datetime | None = None,
         limit: int | None = None,
     ) -> List[Event]: ...
+    def iter_agent_events(
+        self,
+        agent_id: str,
+        window_start: datetime | None = None,
+        window_end: datetime | None = None,
+        limit: int | None = None,
+    ) -> Iterator[Event]: ...
+    def get_events_for_agents(
+        self,
+        agent_ids: List[str],
+        window_start: datetime | None = None,
+        window_end: datetime | None = None,
+        limit: int | None = None,
+    ) -> Dict[str, List[Event]]: ...
 
 class CoverageProfileRepository(Protocol):
     def get(self, profile_key: str) -> Optional[CoverageProfile]: ...
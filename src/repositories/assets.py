@@ -1,6 +1,6 @@
-from typing import Protocol, Set
+from typing import AbstractSet, Protocol
 from src.domain.assets import Asset
 
 class AssetRepository(Protocol):
     def get_asset(self, symbol: str) -> Asset: ...
-    def list_symbols(self) -> Set[str]: ...
\ No newline at end of file
+    def list_symbols(self) -> AbstractSet[str]: ...
\ No newline at end of file
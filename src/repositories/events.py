@@ -1,4 +1,4 @@
-from typing import Protocol, List
+from typing import Iterator, Protocol, List
 from dataclasses import dataclass
 from src.domain.events import Event
 from datetime import datetime
@@ -12,6 +12,15 @@ class EventRepository(Protocol):
         limit: int | None = None,
     ) -> List[Event]: ...
 
+    # Streaming form of get_events_by_categories: rows are paged and mapped lazily
+    def iter_events_by_categories(
+        self,
+        categories: List[str],
+        window_start: datetime | None = None,
+        window_end: datetime | None = None,
+        limit: int | None = None,
+    ) -> Iterator[Event]: ...
+
     def count_in_window(
         self,
         window_start: datetime,
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Protocol, List
+from typing import Iterator, Protocol, List
 
 from src.domain.observations import Observation
 
@@ -8,6 +8,7 @@ from src.domain.observations import Observation
 class ObservationRepository(Protocol):
     def upsert_many(self, observations: List[Observation]) -> "ObservationUpsertResult": ...
     def list_in_window(self, window_start: datetime, window_end: datetime) -> List[Observation]: ...
+    def iter_in_window(self, window_start: datetime, window_end: datetime) -> Iterator[Observation]: ...
 
 
 @dataclass
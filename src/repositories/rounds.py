@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Protocol, List
+from typing import Iterable, Protocol
 
 from src.domain.rounds import RoundEvaluation
 
@@ -15,4 +15,5 @@ class SaveRoundResult:
 
 class RoundRepository(Protocol):
     def save_evaluation(self, evaluation: RoundEvaluation) -> SaveRoundResult: ...
-    def existing_round_keys(self, keys: List[str]) -> set[str]: ...
\ No newline at end of file
+    # Must return a set: callers use it for O(1) membership checks
+    def existing_round_keys(self, keys: Iterable[str]) -> set[str]: ...
\ No newline at end of file
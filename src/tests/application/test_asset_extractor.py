@@ -0,0 +1,54 @@
+import datetime as dt
+
+from src.application.services.asset_extractor import AssetExtractor
+from src.domain.assets import Asset
+from src.domain.events import Event
+
+
+def _event(title="", content="", categories=()):
+    return Event(
+        event_id="coindesk:1",
+        occurred_at=dt.datetime(2025, 9, 4, 21, 0, tzinfo=dt.timezone.utc),
+        title=title,
+        content=content,
+        categories=list(categories),
+    )
+
+
+def test_matches_whole_tickers_case_insensitively():
+    ex = AssetExtractor({"BTC", "ETH", "ETHW", "SOL"})
+    ev = _event(title="btc rallies; $eth and ETHW follow", content="SOLANA is not SOL-USD? sol.")
+    assert ex.extract_symbols(ev) == {"BTC", "ETH", "ETHW", "SOL"}
+
+
+def test_ignores_tickers_inside_words():
+    ex = AssetExtractor({"ETH", "OP"})
+    assert ex.extract_symbols(_event(title="Ethereum TOPS charts", content="ETH2x")) == set()
+
+
+def test_non_alphanumeric_symbols_use_pattern():
+    ex = AssetExtractor({"BTC.D", "BTC"})
+    assert ex.extract_symbols(_event(content="watch btc.d today")) == {"BTC.D", "BTC"}
+
+
+def test_categories_and_assets_sorted():
+    ex = AssetExtractor({"BTC", "ETH"})
+    ev = _event(title="market wrap", categories=[" eth ", "MARKET"])
+    assert ex.extract_symbols(ev) == {"ETH"}
+    assert ex.extract_assets(_event(title="ETH then BTC")) == [Asset("BTC"), Asset("ETH")]
+
+
+def test_no_symbols_matches_nothing():
+    assert AssetExtractor(set()).extract_symbols(_event(title="BTC")) == set()
+
+
+def test_iter_assets_sorted_is_lazy_and_ordered():
+    it = AssetExtractor({"BTC", "ETH", "SOL"}).iter_assets_sorted(_event(title="sol eth btc"))
+    assert next(it) == Asset("BTC")
+    assert list(it) == [Asset("ETH"), Asset("SOL")]
+
+
+def test_short_text_still_checks_categories():
+    ex = AssetExtractor({"BTC", "ETH"})
+    assert ex.extract_symbols(_event(title="", content="", categories=["btc"])) == {"BTC"}
+    assert ex.extract_symbols(_event(title="OK", content="")) == set()
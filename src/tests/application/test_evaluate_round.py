@@ -0,0 +1,80 @@
+import datetime as dt
+
+from src.application.ports import PriceChangeDTO
+from src.application.use_cases.evaluate_round import EvaluateRound
+from src.domain.observations import Observation
+from src.domain.rounds import Round
+
+UTC = dt.timezone.utc
+START = dt.datetime(2025, 9, 4, 21, 0, tzinfo=UTC)
+END = dt.datetime(2025, 9, 4, 22, 0, tzinfo=UTC)
+
+
+class FakeObservations:
+    def __init__(self, obs):
+        self.obs = obs
+
+    def list_in_window(self, window_start, window_end):
+        return list(self.obs)
+
+    def iter_in_window(self, window_start, window_end):
+        return iter(self.obs)
+
+
+class FakeIndicators:
+    def __init__(self, pct):
+        self.pct = pct
+        self.calls = []
+
+    def get_price_changes(self, assets, start, end, timeframe="1h", quote="USDT"):
+        assets = list(assets)
+        self.calls.append([a.symbol for a in assets])
+        return {
+            a.symbol: PriceChangeDTO(start, end, 100.0, 100.0 + self.pct[a.symbol], self.pct[a.symbol], self.pct[a.symbol])
+            for a in assets
+            if a.symbol in self.pct
+        }
+
+
+def test_scores_observations_with_one_batched_price_lookup():
+    obs = [
+        Observation(agent_id="a1", event_id="e1", asset_symbol="btc", zi_score=2, id="o1"),
+        Observation(agent_id="a2", event_id="e1", asset_symbol="BTC", zi_score=-1, id="o2"),
+        Observation(agent_id="a1", event_id="e2", asset_symbol="ETH", zi_score=1, id="o3"),
+        Observation(agent_id="a3", event_id="e3", asset_symbol="DOGE", zi_score=1, id="o4"),  # unpriced
+        Observation(agent_id="a3", event_id="e4", asset_symbol="ETH", zi_score=None, id="o5"),  # no score
+        Observation(agent_id="a3", event_id="e5", asset_symbol="ETH", zi_score=1),  # no id
+        Observation(agent_id="a3", event_id="e6", asset_symbol="SOL", zi_score=1),  # no id, not priced
+    ]
+    ind = FakeIndicators({"BTC": 1.5, "ETH": -2.0})
+    res = EvaluateRound(observations=FakeObservations(obs), indicators=ind).run(
+        Round(key="r", window_start=START, window_end=END)
+    )
+
+    assert ind.calls == [["BTC", "DOGE", "ETH"]]
+    assert [(s.observation_id, s.score) for s in res.agent_scores] == [
+        ("o1", 3.0),
+        ("o2", -1.5),
+        ("o3", -2.0),
+    ]
+
+
+def test_no_observations_skips_price_lookup():
+    ind = FakeIndicators({})
+    res = EvaluateRound(observations=FakeObservations([]), indicators=ind).run(
+        Round(key="r", window_start=START, window_end=END)
+    )
+    assert res.agent_scores == []
+    assert ind.calls == []
+
+
+def test_top_k_keeps_best_scores_in_order():
+    obs = [
+        Observation(agent_id=f"a{i}", event_id=f"e{i}", asset_symbol="BTC", zi_score=z, id=f"o{i}")
+        for i, z in enumerate([1, -2, 3, 0, 2])
+    ]
+    ind = FakeIndicators({"BTC": 1.0})
+    res = EvaluateRound(observations=FakeObservations(obs), indicators=ind).run(
+        Round(key="r", window_start=START, window_end=END), top_k=2
+    )
+    assert [(s.observation_id, s.score) for s in res.agent_scores] == [("o2", 3.0), ("o4", 2.0)]
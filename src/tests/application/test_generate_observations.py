@@ -0,0 +1,68 @@
+import datetime as dt
+
+from src.application.ports import EventFactorDTO
+from src.application.use_cases.generate_observations_for_active_agents import GenerateObservationsForActiveAgents
+from src.domain.agents import Agent, CoverageProfile
+from src.domain.assets import Asset
+from src.domain.events import Event
+from src.repositories.observations import ObservationUpsertResult
+
+UTC = dt.timezone.utc
+AT = dt.datetime(2025, 9, 4, 21, 0, tzinfo=UTC)
+
+
+class FakeAgents:
+    def __init__(self, agents, events):
+        self.agents = agents
+        self.events = events
+
+    def list_active(self):
+        return list(self.agents)
+
+    def get_events_for_agents(self, agent_ids, window_start=None, window_end=None, limit=None):
+        return {agent_id: list(self.events) for agent_id in agent_ids}
+
+
+class FakeObservations:
+    def __init__(self):
+        self.written = []
+
+    def upsert_many(self, observations):
+        self.written.extend(observations)
+        return ObservationUpsertResult(inserted=len(observations), updated=0, observations=list(observations))
+
+
+class FlakyFactorizer:
+    def __init__(self, failing):
+        self.failing = failing
+        self.calls = []
+
+    def factorize(self, event, max_tokens=256, agent_role=None, indicators_context=None):
+        self.calls.append(event.event_id)
+        if event.event_id in self.failing:
+            raise RuntimeError("LLM unavailable")
+        return EventFactorDTO(factor=f"factor {event.event_id}", zi_score=1, confidence=5)
+
+
+def _event(event_id):
+    return Event(event_id=event_id, occurred_at=AT, title="t", content="c", categories=["BTC"], asset=Asset(symbol="BTC"))
+
+
+def test_failed_prompt_is_skipped_and_the_rest_are_written():
+    agents = [Agent(agent_id="a1", name="A1", coverage_profile_key=CoverageProfile(profile_key="p", name="P", role="r"))]
+    events = [_event("src:1"), _event("src:2"), _event("src:3")]
+    observations = FakeObservations()
+    factorizer = FlakyFactorizer(failing={"src:2"})
+    uc = GenerateObservationsForActiveAgents(
+        agents=FakeAgents(agents, events),
+        observations=observations,
+        factorizer=factorizer,
+        max_concurrency=2,
+    )
+
+    res = uc.run()
+
+    assert sorted(factorizer.calls) == ["src:1", "src:2", "src:3"]
+    assert [o.event_id for o in observations.written] == ["src:1", "src:3"]
+    assert res.upserted.inserted == 2
+    assert res.total_events == 3
@@ -0,0 +1,39 @@
+import datetime as dt
+
+from src.application.ports import SMACrossDTO
+from src.application.services.indicator_snapshot import IndicatorSnapshotBuilder
+from src.domain.assets import Asset
+
+UTC = dt.timezone.utc
+AT = dt.datetime(2025, 9, 4, 21, 0, tzinfo=UTC)
+
+
+class FakeIndicators:
+    def __init__(self, markets):
+        self.markets = markets
+        self.calls = []
+
+    def supported_symbols(self, assets, quote="USDT"):
+        return {a.symbol for a in assets} & self.markets
+
+    def prefetch(self, asset, at, timeframe="1h", lookback=200, market=None, quote="USDT"):
+        self.calls.append(("prefetch", asset.symbol, lookback))
+
+    def get_rsi(self, asset, at, timeframe="1h", period=14, market=None, quote="USDT"):
+        self.calls.append(("rsi", asset.symbol, at))
+        return 55.5
+
+    def get_sma_cross(self, asset, at, timeframe="1h", fast_period=50, slow_period=200, market=None, quote="USDT"):
+        self.calls.append(("sma", asset.symbol, at))
+        return SMACrossDTO(fast=2.0, slow=1.0, prev_fast=0.5, prev_slow=1.0, crossed="golden")
+
+
+def test_build_many_dedupes_pairs_and_skips_unsupported_assets():
+    ind = FakeIndicators(markets={"BTC"})
+    builder = IndicatorSnapshotBuilder(ind)
+    snaps = builder.build_many([(Asset("BTC"), AT), (Asset("BTC"), AT), (Asset("XYZ"), AT)])
+
+    assert ind.calls == [("prefetch", "BTC", 200), ("rsi", "BTC", AT), ("sma", "BTC", AT)]
+    assert snaps[("BTC", AT)].text == "RSI(14,1h)=55.50; SMA50/200(1h)=2.00/1.00,golden"
+    # Same text `build` produces when both lookups fail
+    assert snaps[("XYZ", AT)].text == "RSI(14,1h)=NA; SMA50/200(1h)=NA"
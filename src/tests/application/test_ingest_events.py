@@ -0,0 +1,40 @@
+import datetime as dt
+
+from src.application.ports import NewsItemDTO
+from src.application.use_cases.ingest_events import IngestEvents
+from src.repositories.events import UpsertResult
+
+UTC = dt.timezone.utc
+AT = dt.datetime(2025, 9, 4, 21, 0, tzinfo=UTC)
+
+
+class FakeFeed:
+    def __init__(self, items):
+        self.items = items
+
+    def fetch(self, limit=10, categories=(), until=None):
+        return list(self.items)
+
+
+class FakeEvents:
+    def upsert_many(self, events):
+        return UpsertResult(inserted=len(events), updated=0, events=list(events))
+
+
+class FakeAssets:
+    def __init__(self, symbols):
+        self.symbols = frozenset(symbols)
+
+    def list_symbols(self):
+        return self.symbols
+
+
+def test_assets_added_between_runs_are_matched():
+    item = NewsItemDTO(external_id="1", external_url="https://example.com/1", published_at=AT, title="BTC and SOL rally", content="", source="src")
+    assets = FakeAssets({"BTC"})
+    uc = IngestEvents(feed=FakeFeed([item]), events=FakeEvents(), assets=assets)
+
+    assert [e.event_id for e in uc.run().events] == ["src:1:BTC"]
+
+    assets.symbols = frozenset({"BTC", "SOL"})
+    assert [e.event_id for e in uc.run().events] == ["src:1:BTC", "src:1:SOL"]
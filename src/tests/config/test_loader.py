@@ -0,0 +1,49 @@
+import os
+
+from src.config.loader import load_base_config
+
+
+def test_missing_file_returns_empty(tmp_path):
+    assert load_base_config(str(tmp_path / "nope.yaml")) == {}
+
+
+def test_load_is_cached_until_file_changes(tmp_path):
+    path = tmp_path / "base.yaml"
+    path.write_text("backfill:\n  n_rounds: 3\n", encoding="utf-8")
+
+    first = load_base_config(str(path))
+    second = load_base_config(str(path))
+    assert first == {"backfill": {"n_rounds": 3}}
+    assert first is second
+
+    path.write_text("backfill:\n  n_rounds: 5\n", encoding="utf-8")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert load_base_config(str(path)) == {"backfill": {"n_rounds": 5}}
+
+
+def test_env_or_value_prefers_env(monkeypatch):
+    from src.config.loader import _read_env, env_or_value
+
+    monkeypatch.setenv("FINORAX_TEST_KEY", "from-env")
+    _read_env.cache_clear()
+    assert env_or_value("FINORAX_TEST_KEY", "from-conf") == "from-env"
+    assert env_or_value("FINORAX_TEST_MISSING", None, "fallback") == "fallback"
+    assert env_or_value(None, "from-conf") == "from-conf"
+
+
+def test_load_settings_casts_and_defaults(tmp_path):
+    from src.config.loader import load_settings
+
+    path = tmp_path / "base.yaml"
+    path.write_text(
+        "indicators:\n  rsi_period: '21'\nnews:\n  categories: [BTC, ETH]\ngeneration:\n  per_agent_limit: null\n",
+        encoding="utf-8",
+    )
+
+    settings = load_settings(str(path))
+    assert settings.ind_rsi_period == 21
+    assert settings.ingest_categories == ("BTC", "ETH")
+    assert settings.gen_per_agent_limit is None
+    assert settings.ind_sma_slow == 200
+    assert load_settings(str(path)) is settings
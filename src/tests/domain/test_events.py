@@ -0,0 +1,33 @@
+import datetime as dt
+
+import pytest
+
+from src.domain.events import Event
+
+UTC = dt.timezone.utc
+
+
+def test_from_dto_normalizes_categories():
+    e = Event.from_dto(
+        external_id="1",
+        published_at=dt.datetime(2025, 9, 4, 21, 0, tzinfo=UTC),
+        categories=[" btc", "", None, "Market ", "  "],
+        title=" Title ",
+        content="body",
+        source="coindesk",
+    )
+    assert e.event_id == "coindesk:1"
+    assert e.title == "Title"
+    assert e.categories == ["BTC", "MARKET"]
+
+
+def test_from_dto_rejects_non_utc():
+    with pytest.raises(ValueError):
+        Event.from_dto(
+            external_id="1",
+            published_at=dt.datetime(2025, 9, 4, 21, 0, tzinfo=dt.timezone(dt.timedelta(hours=2))),
+            categories=[],
+            title="t",
+            content="",
+            source="coindesk",
+        )
@@ -0,0 +1,24 @@
+import datetime as dt
+
+from src.domain.rounds import Round
+
+UTC = dt.timezone.utc
+
+
+def test_snapped_sets_epoch_buckets():
+    rnd = Round(
+        key="r",
+        window_start=dt.datetime(2025, 9, 4, 21, 39, tzinfo=UTC),
+        window_end=dt.datetime(2025, 9, 4, 22, 39, tzinfo=UTC),
+    ).snapped(timeframe="1h")
+
+    assert rnd.window_start == dt.datetime(2025, 9, 4, 21, 0, tzinfo=UTC)
+    assert rnd.window_end == dt.datetime(2025, 9, 4, 22, 0, tzinfo=UTC)
+    assert rnd.start_bucket == int(rnd.window_start.timestamp())
+    assert rnd.end_bucket == rnd.start_bucket + 3600
+
+
+def test_buckets_do_not_affect_equality():
+    start = dt.datetime(2025, 9, 4, 21, 0, tzinfo=UTC)
+    end = dt.datetime(2025, 9, 4, 22, 0, tzinfo=UTC)
+    assert Round(key="r", window_start=start, window_end=end) == Round(key="r", window_start=start, window_end=end).snapped()
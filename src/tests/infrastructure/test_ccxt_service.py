@@ -0,0 +1,280 @@
+import math
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.infrastructure.indicators.ccxt_service import CcxtIndicatorService
+
+
+def _service() -> CcxtIndicatorService:
+    # Skip __init__: the math helpers do not touch the exchange
+    return CcxtIndicatorService.__new__(CcxtIndicatorService)
+
+
+def _reference_rsi(closes, period):
+    if len(closes) < period + 1:
+        return [None] * len(closes)
+    changes = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
+    gains = [max(ch, 0.0) for ch in changes]
+    losses = [max(-ch, 0.0) for ch in changes]
+    ag = sum(gains[:period]) / period
+    al = sum(losses[:period]) / period
+    out = [None] * len(closes)
+
+    def rsi(g, l):
+        return 100.0 if l == 0 else 100.0 - 100.0 / (1.0 + g / l)
+
+    out[period] = rsi(ag, al)
+    for i in range(period + 1, len(closes)):
+        ag = (ag * (period - 1) + gains[i - 1]) / period
+        al = (al * (period - 1) + losses[i - 1]) / period
+        out[i] = rsi(ag, al)
+    return out
+
+
+@pytest.mark.parametrize("period", [2, 14, 30])
+def test_rsi_series_matches_reference(period):
+    rng = random.Random(period)
+    closes = [100.0]
+    for _ in range(3 * period + 2):
+        closes.append(closes[-1] * (1 + rng.uniform(-0.02, 0.02)))
+
+    got = _service()._rsi_series(closes, period)
+    exp = _reference_rsi(closes, period)
+    assert len(got) == len(exp)
+    for g, e in zip(got, exp):
+        if e is None:
+            assert g is None
+        else:
+            assert math.isclose(g, e, rel_tol=1e-12)
+
+
+def test_rsi_series_all_gains_is_100():
+    got = _service()._rsi_series([float(i) for i in range(1, 20)], 14)
+    assert got[:14] == [None] * 14
+    assert got[14:] == [100.0] * 5
+
+
+def test_rsi_series_short_input():
+    assert _service()._rsi_series([1.0, 2.0], 14) == [None, None]
+
+
+def test_sma_series_alignment():
+    closes = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    sma = _service()._sma_series(closes, 3)
+    assert np.isnan(sma[:2]).all()
+    assert sma[2:].tolist() == pytest.approx([2.0, 3.0, 4.0])
+
+
+def test_sma_series_shorter_than_period():
+    assert np.isnan(_service()._sma_series(np.array([1.0, 2.0]), 3)).all()
+
+
+HOUR_MS = 3_600_000
+
+
+class FakeExchange:
+    """Serves hourly candles whose close equals the candle index; records fetches."""
+
+    def __init__(self):
+        self.calls = []
+        self.markets = {"BTC/USDT": {}}
+
+    def parse_timeframe(self, timeframe):
+        return 3600
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.calls.append((since, limit))
+        return [[since + i * HOUR_MS, 1, 1, 1, float((since + i * HOUR_MS) // HOUR_MS), 1] for i in range(limit)]
+
+
+def _cached_service(ttl=300.0):
+    import logging
+    import threading
+    from collections import OrderedDict
+
+    svc = _service()
+    svc.exchange = FakeExchange()
+    svc._log = logging.getLogger("test")
+    svc._ohlcv_cache = OrderedDict()
+    svc._ohlcv_cache_size = 8
+    svc._ohlcv_cache_ttl = ttl
+    svc._ohlcv_lock = threading.Lock()
+    svc._listing_cache = {}
+    svc._unknown_symbols = {}
+    svc._frame_ms_cache = {}
+    return svc
+
+
+def test_fetch_ohlcv_serves_covered_ranges_from_cache():
+    svc = _cached_service()
+    base = 1_000 * HOUR_MS  # long closed
+    first = svc._fetch_ohlcv("BTC/USDT", "1h", base, 50)
+    assert first.ts.tolist() == [base + i * HOUR_MS for i in range(50)]
+
+    inner = svc._fetch_ohlcv("BTC/USDT", "1h", base + 10 * HOUR_MS, 20)
+    assert inner.close.tolist() == [float(1_010 + i) for i in range(20)]
+    assert len(svc.exchange.calls) == 1
+
+
+def test_fetch_ohlcv_fetches_only_missing_tail():
+    svc = _cached_service()
+    base = 1_000 * HOUR_MS
+    svc._fetch_ohlcv("BTC/USDT", "1h", base, 10)
+    out = svc._fetch_ohlcv("BTC/USDT", "1h", base + 5 * HOUR_MS, 10)
+
+    assert svc.exchange.calls == [(base, 10), (base + 10 * HOUR_MS, 5)]
+    assert out.ts.tolist() == [base + (5 + i) * HOUR_MS for i in range(10)]
+
+
+def test_fetch_ohlcv_refetches_open_candle():
+    import time
+
+    svc = _cached_service()
+    open_ts = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+    since = open_ts - 3 * HOUR_MS
+    svc._fetch_ohlcv("BTC/USDT", "1h", since, 4)
+    svc._fetch_ohlcv("BTC/USDT", "1h", since, 4)
+    # The still-open candle is never marked covered, so only it is requested again
+    assert svc.exchange.calls == [(since, 4), (open_ts, 1)]
+
+
+def test_fetch_ohlcv_remembers_missing_closed_candles():
+    svc = _cached_service()
+    base = 1_000 * HOUR_MS
+    gap = base + 5 * HOUR_MS
+    fetch = svc.exchange.fetch_ohlcv
+    svc.exchange.fetch_ohlcv = lambda **kw: [r for r in fetch(**kw) if r[0] != gap]
+
+    svc._fetch_ohlcv("BTC/USDT", "1h", base, 10)
+    # The "fetch again starting at the missing candle" fallback is answered from cache
+    retry = svc._fetch_ohlcv("BTC/USDT", "1h", gap, 3)
+    assert retry.ts.tolist() == [gap + HOUR_MS, gap + 2 * HOUR_MS]
+    assert len(svc.exchange.calls) == 1
+
+
+def test_rsi_series_long_input_matches_reference():
+    # Long enough to take the vectorised smoothing path when pandas is installed
+    rng = random.Random(7)
+    closes = [100.0]
+    for _ in range(2_000):
+        closes.append(closes[-1] * (1 + rng.uniform(-0.02, 0.02)))
+
+    got = _service()._rsi_series(closes, 14)
+    exp = _reference_rsi(closes, 14)
+    assert got[:14] == [None] * 14
+    assert got[14:] == pytest.approx(exp[14:], rel=1e-9)
+
+
+def test_sma_at_matches_series():
+    rng = random.Random(3)
+    closes = np.array([100 + rng.uniform(-5, 5) for _ in range(60)])
+    svc = _service()
+    csum = svc._cumsum(closes)
+    series = svc._sma_series(closes, 20)
+    for idx in (19, 35, 59):
+        assert svc._sma_at(csum, 20, idx) == pytest.approx(closes[idx - 19 : idx + 1].mean())
+        assert svc._sma_at(csum, 20, idx) == pytest.approx(series[idx])
+    assert math.isnan(svc._sma_at(csum, 20, 18))
+
+
+def test_index_and_price_lookups_search_sorted_candles():
+    svc = _service()
+    candles = svc._normalize_ohlcv([[ts, 0, 0, 0, float(ts), 0] for ts in (40, 10, 20)])
+    assert svc._index_of_ts(candles, 20) == 1
+    assert svc._index_of_ts(candles, 30) is None
+    assert svc._price_at_or_before(candles, 39) == (20, 20.0)
+    assert svc._price_at_or_before(candles, 40) == (40, 40.0)
+    assert svc._price_at_or_before(candles, 5) is None
+
+
+def test_normalize_and_merge_ohlcv_arrays():
+    svc = _cached_service()
+    rows = [[20, 1, 1, 1, 2.0, 1], [10, 1, 1, 1, 1.0, 1], [30, 1, 1, 1, None, 1], [5, 1, 1]]
+    a = svc._normalize_ohlcv(rows)
+    assert a.ts.tolist() == [10, 20]
+    assert a.close.dtype == np.float64
+    b = svc._normalize_ohlcv([[20, 1, 1, 1, 9.0, 1], [40, 1, 1, 1, 4.0, 1]])
+    merged = svc._merge_ohlcv(a, b)
+    assert merged.ts.tolist() == [10, 20, 40]
+    assert merged.close.tolist() == [1.0, 9.0, 4.0]
+
+
+def test_prefetch_serves_rsi_and_sma_cross_from_one_fetch():
+    import datetime as dt
+
+    from src.domain.assets import Asset
+
+    svc = _cached_service()
+    at = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+    svc.prefetch(Asset("BTC"), at, lookback=max(3 * 14, 200))
+    svc.get_rsi(Asset("BTC"), at)
+    cross = svc.get_sma_cross(Asset("BTC"), at)
+    assert len(svc.exchange.calls) == 1
+    assert cross.fast > cross.slow
+
+
+class ListedExchange(FakeExchange):
+    """Returns empty pages for any `since` before `listing`."""
+
+    def __init__(self, listing):
+        super().__init__()
+        self.listing = listing
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.calls.append((since, limit))
+        if since < self.listing:
+            return []
+        return [[since + i * HOUR_MS, 1, 1, 1, 1.0, 1] for i in range(limit)]
+
+
+def test_listing_ms_binary_searches_empty_pages_and_caches():
+    svc = _cached_service()
+    listing = 100_000 * HOUR_MS * 4  # well after the search lower bound
+    svc.exchange = ListedExchange(listing)
+    assert svc._listing_ms("BTC/USDT", "1h") == listing
+    calls = len(svc.exchange.calls)
+    assert svc._listing_ms("BTC/USDT", "1h") == listing
+    assert len(svc.exchange.calls) == calls
+
+
+def test_rsi_before_listing_fails_without_refetching():
+    import datetime as dt
+
+    from src.domain.assets import Asset
+
+    svc = _cached_service()
+    at = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+    svc._listing_cache[("BTC/USDT", "1h")] = int(at.timestamp() * 1000) + 10 * HOUR_MS
+    svc.exchange = ListedExchange(svc._listing_cache[("BTC/USDT", "1h")])
+    with pytest.raises(ValueError, match="not listed"):
+        svc.get_rsi(Asset("BTC"), at)
+    assert len(svc.exchange.calls) == 1
+
+
+def test_unknown_symbol_reloads_markets_once():
+    svc = _cached_service()
+    reloads = []
+    svc.exchange.load_markets = lambda reload=False: reloads.append(reload)
+    for _ in range(3):
+        with pytest.raises(ValueError, match="Market symbol not found"):
+            svc._validate_symbol("NOPE/USDT")
+    assert reloads == [True]
+    svc._validate_symbol("BTC/USDT")
+    assert reloads == [True]
+
+
+def test_talib_rsi_backend_matches_reference():
+    pytest.importorskip("talib")
+    rng = random.Random(11)
+    closes = [100.0]
+    for _ in range(300):
+        closes.append(closes[-1] + rng.uniform(-2, 2))
+    svc = _service()
+    svc._rsi_backend = "talib"
+    got = svc._rsi_series(closes, 14)
+    want = _reference_rsi(closes, 14)
+    assert got[:14] == [None] * 14
+    assert got[14:] == pytest.approx(want[14:])
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.infrastructure.indicators.ccxt_service import CcxtIndicatorService
+from src.infrastructure.indicators.streaming import RsiStreamer, SmaStreamer
+
+
+def _closes(n, seed=5):
+    rng = random.Random(seed)
+    closes = [100.0]
+    for _ in range(n - 1):
+        closes.append(closes[-1] + rng.uniform(-2, 2))
+    return closes
+
+
+def test_rsi_streamer_matches_batch_series():
+    closes = _closes(120)
+    svc = CcxtIndicatorService.__new__(CcxtIndicatorService)
+    want = svc._rsi_series(closes, 14)
+    rsi = RsiStreamer(14)
+    got = [rsi.push(c) for c in closes]
+    assert got[:14] == [None] * 14
+    assert got[14:] == pytest.approx(want[14:])
+
+
+def test_sma_streamer_matches_batch_series():
+    closes = _closes(60)
+    svc = CcxtIndicatorService.__new__(CcxtIndicatorService)
+    want = svc._sma_series(np.array(closes), 20)
+    sma = SmaStreamer(20)
+    got = [sma.push(c) for c in closes]
+    assert got[:19] == [None] * 19
+    assert got[19:] == pytest.approx(want[19:].tolist())
+
+
+def test_streamers_reject_non_positive_period():
+    with pytest.raises(ValueError):
+        RsiStreamer(0)
+    with pytest.raises(ValueError):
+        SmaStreamer(0)
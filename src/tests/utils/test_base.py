@@ -0,0 +1,45 @@
+import pytest
+
+from src.utils.base import chunked, extract_json_block, parse_json
+
+
+def test_chunked_splits_with_short_tail():
+    assert list(chunked([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+
+
+def test_chunked_empty_input_yields_nothing():
+    assert list(chunked([], 3)) == []
+
+
+def test_chunked_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        list(chunked([1], 0))
+
+
+def test_extract_json_block_prefers_fenced_json():
+    text = 'Sure:\n```json\n{"factor": "x", "zi_score": 1}\n```\ntrailing {"a": 2}'
+    assert extract_json_block(text) == {"factor": "x", "zi_score": 1}
+
+
+def test_extract_json_block_finds_bare_object():
+    assert extract_json_block('noise {"confidence": 7} noise') == {"confidence": 7}
+
+
+def test_extract_json_block_bare_object_and_trailing_noise():
+    assert extract_json_block(' {"zi_score": -1}\n') == {"zi_score": -1}
+    assert extract_json_block('{"zi_score": 2} done') == {"zi_score": 2}
+
+
+def test_extract_json_block_invalid_raises_value_error():
+    with pytest.raises(ValueError):
+        extract_json_block("no json here")
+
+
+def test_parse_json_accepts_bytes_and_str():
+    assert parse_json(b'{"Data": [1, 2]}') == {"Data": [1, 2]}
+    assert parse_json('{"a": "x"}') == {"a": "x"}
+
+
+def test_extract_json_block_ignores_braces_inside_strings():
+    text = 'Answer: {"factor": "BTC {up} \\"}\\" move", "zi_score": 1} and {"other": 2}'
+    assert extract_json_block(text) == {"factor": 'BTC {up} "}" move', "zi_score": 1}
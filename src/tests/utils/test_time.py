@@ -1,5 +1,5 @@
 import pytest
-from src.utils.time import snap_to_interval
+from src.utils.time import parse_iso_datetime, snap_to_interval
 import datetime as dt
 
 UTC = dt.timezone.utc
@@ -82,4 +82,11 @@ def test_idempotency():
 ])
 def test_bad_freq_raises(bad_freq):
     with pytest.raises(ValueError):
-        snap_to_interval(freq=bad_freq) 
\ No newline at end of file
+        snap_to_interval(freq=bad_freq) 
+
+
+def test_parse_iso_datetime_handles_z_and_offsets():
+    want = dt.datetime(2025, 9, 4, 21, 0, 5, 123000, tzinfo=UTC)
+    assert parse_iso_datetime("2025-09-04T21:00:05.123Z") == want
+    assert parse_iso_datetime("2025-09-04T21:00:05.123+00:00") == want
+    assert parse_iso_datetime("2025-09-04T21:00:05.123+00:00").utcoffset() == dt.timedelta(0)
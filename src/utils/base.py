@@ -1,20 +1,93 @@
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Sequence, Tuple, TypeVar
 import json
 import re
 
+try:  # optional fast JSON decoder; falls back to the stdlib
+    import orjson as _orjson  # type: ignore
+
+    _json_loads = _orjson.loads
+except ImportError:  # pragma: no cover - depends on environment
+    _json_loads = json.loads
+
+T = TypeVar("T")
+
+# Characters that matter when scanning for a balanced object; runs of anything else are skipped in C
+_JSON_STRUCT_RE = re.compile(r'[{}"\\]')
+
+
+def parse_json(data: str | bytes) -> Any:
+    """Decode a JSON document (str or raw bytes) with the fastest available decoder."""
+    return _json_loads(data)
+
+
 def extract_json_block(text: str) -> Dict[str, Any]:
     if not text:
         raise ValueError("Empty response from LLM")
 
-    fenced = re.search(r"```json\s*(\{[\s\S]*?\})\s*```", text, flags=re.IGNORECASE)
-    if fenced:
-        return json.loads(fenced.group(1))
+    # The model is asked for a bare JSON object: try that before any scanning
+    stripped = text.strip()
+    if stripped.startswith("{"):
+        try:
+            return _json_loads(stripped)
+        except ValueError:
+            pass
+
+    # Prefer a ```json fenced block when the model wrapped its answer in one
+    fence = text.find("```")
+    while fence != -1:
+        if text[fence + 3 : fence + 7].lower() == "json":
+            span = _find_json_span(text, fence + 7)
+            if span is not None:
+                return _json_loads(text[span[0] : span[1]])
+            break
+        fence = text.find("```", fence + 3)
 
-    text = re.sub(r"```[a-zA-Z]*", "", text)
+    span = _find_json_span(text)
+    if span is not None:
+        try:
+            return _json_loads(text[span[0] : span[1]])
+        except ValueError:
+            pass
 
     start = text.find("{")
     end = text.rfind("}")
     if start != -1 and end != -1 and end > start:
-        return json.loads(text[start : end + 1])
+        return _json_loads(text[start : end + 1])
+
+    return _json_loads(text)
+
+
+def _find_json_span(text: str, start: int = 0) -> Tuple[int, int] | None:
+    """(begin, end) of the first balanced `{...}` at or after `start`; braces inside strings don't count."""
+    begin = text.find("{", start)
+    if begin == -1:
+        return None
+    depth = 0
+    in_str = False
+    skip = -1  # position of a backslash-escaped character
+    for m in _JSON_STRUCT_RE.finditer(text, begin):
+        i = m.start()
+        if i == skip:
+            continue
+        ch = m.group()
+        if in_str:
+            if ch == "\\":
+                skip = i + 1
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return begin, i + 1
+    return None
+
 
-    return json.loads(text)
\ No newline at end of file
+def chunked(items: Sequence[T], size: int) -> Iterator[List[T]]:
+    if size <= 0:
+        raise ValueError("size must be > 0")
+    for i in range(0, len(items), size):
+        yield list(items[i : i + size])
@@ -1,17 +1,33 @@
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Literal
 import re
 
+try:  # optional C ISO-8601 parser; falls back to datetime.fromisoformat
+    from ciso8601 import parse_datetime as _parse_datetime  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    _parse_datetime = None
+
 _UNITS = {"m": 60, "h": 3600, "d": 86400}
+_FREQ_RE = re.compile(r"\s*(\d+)\s*([mhdMHD])\s*")
 
+@lru_cache(maxsize=128)
 def _parse_freq(freq: str) -> int:
     """'30m' -> 1800; '1h' -> 3600; '1d' -> 86400."""
-    m = re.fullmatch(r"\s*(\d+)\s*([mhdMHD])\s*", freq)
+    m = _FREQ_RE.fullmatch(freq)
     if not m:
         raise ValueError("freq must look like '30m', '1h', or '1d'")
     n, u = m.groups()
     return int(n) * _UNITS[u.lower()]
 
+def parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO-8601 timestamp as returned by the database (a trailing 'Z' means UTC)."""
+    if _parse_datetime is not None:
+        return _parse_datetime(value)
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value)
+
 def snap_to_interval(
     dt: datetime | None = None,
     freq: str = "1h",